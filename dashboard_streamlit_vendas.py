@@ -5,14 +5,16 @@ Aplicação Streamlit para visualização de dados e conceitos de percepção vi
 
 import streamlit as st
 import pandas as pd
+import requests
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
+from pathlib import Path
+import os
+import uuid
+from string import Template
 import warnings
 
-warnings.filterwarnings('ignore')
+warnings.filterwarnings('ignore', category=DeprecationWarning)
 
 # Configuração da página
 st.set_page_config(
@@ -57,41 +59,280 @@ CORES = {
     'destaque': '#C73E1D'
 }
 
+# Semestre de cada mês (índice = mês - 1)
+SEMESTRE_POR_MES = np.array(['S1'] * 6 + ['S2'] * 6)
+
+# Nome abreviado de cada mês (índice = mês - 1)
+MESES_NOME = np.array(['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
+                       'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez'])
+
+# Cor de cada mês no gráfico de sazonalidade (índice = mês; posição 0 não usada)
+COR_MES = np.full(13, CORES['neutro'], dtype=object)
+COR_MES[[11, 12]] = CORES['destaque']  # Black Friday e Natal
+COR_MES[[6, 7]] = CORES['alerta']  # Meio do ano
+
+LOGO_URL = "https://via.placeholder.com/300x100/2E86AB/FFFFFF?text=CRISP-DM+Dashboard"
+
+# Acima deste número de pontos, séries de linha usam WebGL (Scattergl)
+LIMITE_WEBGL_LINHA = 1_000
+
+# Acima deste número de pontos, séries temporais são reduzidas por médias em blocos
+LIMITE_PONTOS_SERIE = 2_000
+
+# Cor e símbolo de cada quadrante da matriz de priorização,
+# indexados por (impacto >= 5) * 2 + (esforço >= 5)
+COR_QUADRANTE = np.array([
+    CORES['neutro'],  # Baixa prioridade
+    CORES['alerta'],  # Repensar
+    CORES['sucesso'],  # Quick wins
+    CORES['principal']  # Estratégico
+])
+SIMBOLO_QUADRANTE = np.array(['circle', 'x', 'star', 'diamond'])
+
+# Roadmap estratégico (página de Deployment)
+ROADMAP = {
+    'Q1 2025': {
+        'foco': 'Expansão Regional',
+        'acoes': ['Piloto no Norte', 'Parceiros locais', 'Análise de mercado'],
+        'cor': CORES['principal']
+    },
+    'Q2 2025': {
+        'foco': 'Novos Produtos',
+        'acoes': ['Linha Premium', 'Testes A/B', 'Feedback clientes'],
+        'cor': CORES['secundaria']
+    },
+    'Q3 2025': {
+        'foco': 'Otimização',
+        'acoes': ['Logística', 'Automação', 'Redução custos'],
+        'cor': CORES['alerta']
+    },
+    'Q4 2025': {
+        'foco': 'Black Friday',
+        'acoes': ['Estoque', 'Marketing', 'Promoções'],
+        'cor': CORES['destaque']
+    }
+}
+
+# HTML de cada card do roadmap, montado uma única vez na importação
+# (em uma linha só, para que o markdown não interprete a indentação como bloco de código)
+CARD_ROADMAP = Template(
+    "<div style='background-color: $cor; color: white; padding: 15px; "
+    "border-radius: 10px; text-align: center; height: 200px;'>"
+    "<h4>$trimestre</h4><h5>$foco</h5>"
+    "<ul style='text-align: left; font-size: 12px;'>$acoes</ul></div>"
+)
+ROADMAP_CARDS = {
+    trimestre: CARD_ROADMAP.substitute(
+        cor=info['cor'],
+        trimestre=trimestre,
+        foco=info['foco'],
+        acoes=''.join(f"<li>{acao}</li>" for acao in info['acoes'])
+    )
+    for trimestre, info in ROADMAP.items()
+}
+
+# Os quatro cards lado a lado em uma grade, emitida com um único st.markdown
+ROADMAP_HTML = (
+    "<div style='display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem;'>"
+    + "".join(ROADMAP_CARDS[trimestre] for trimestre in ROADMAP)
+    + "</div>"
+)
+
+# Boas práticas (página de Conceitos), unidas em um único bloco de markdown
+BOAS_PRATICAS = (
+    "📊 **Escolha apropriada de gráficos**: Linha para tendências, Barra para comparações",
+    "🎨 **Uso estratégico de cores**: Máximo 5-7 cores distintas",
+    "📝 **Hierarquia clara**: Títulos, subtítulos e anotações",
+    "🎯 **Foco no essencial**: Eliminação de elementos desnecessários",
+    "📖 **Narrativa visual**: Guiar o leitor através dos dados",
+    "♿ **Acessibilidade**: Contraste adequado e texto legível"
+)
+BOAS_PRATICAS_MD = "\n\n".join(BOAS_PRATICAS)
+
+# Marcador de cada categoria da análise SWOT (no lugar das caixas de alerta por item)
+MARCADORES_SWOT = {
+    'forcas': '🟢',
+    'oportunidades': '🔵',
+    'fraquezas': '🟡',
+    'ameacas': '🔴'
+}
+
+# Itens fixos da análise SWOT (as forças dependentes dos dados são montadas na página)
+FORCAS_FIXAS = (
+    "Domínio no Sudeste (40% do mercado)",
+    "Portfólio diversificado"
+)
+FRAQUEZAS = (
+    "Baixa penetração no Norte (7%)",
+    "Dependência do Q4 (30% vendas)",
+    "Variação de margem regional",
+    "Concentração em poucos produtos"
+)
+OPORTUNIDADES = (
+    "Potencial de 45% no Norte/Nordeste",
+    "Demanda crescente por Notebooks",
+    "Expansão em acessórios",
+    "Novos canais de venda"
+)
+AMEACAS = (
+    "Sazonalidade afeta fluxo de caixa",
+    "Concentração regional = risco",
+    "Competição crescente",
+    "Volatilidade econômica"
+)
+
 # =============================================================================
 # FUNÇÕES AUXILIARES
 # =============================================================================
 
+def versao_dados():
+    """Versão do dataset: mtime do arquivo de origem lido por carregar_dados
+    
+    O CSV quando existe (a cópia Parquet é derivada dele); senão a própria cópia Parquet.
+    """
+    for arquivo in (Path('dataset_vendas_completo.csv'), Path('dataset_vendas_completo.parquet')):
+        if arquivo.exists():
+            return arquivo.stat().st_mtime_ns
+    return 0
+
 @st.cache_data
-def carregar_dados():
-    """Carrega e prepara o dataset de vendas"""
+def carregar_dados(versao):
+    """Carrega e prepara o dataset de vendas (recarregado quando versao_dados() muda)"""
+    arquivo_csv = Path('dataset_vendas_completo.csv')
+    arquivo_parquet = arquivo_csv.with_suffix('.parquet')
+    
+    # Cópia Parquet já processada (tipos e features preservados), desde que seja
+    # mais recente que o CSV e que este script (que define as features)
+    if arquivo_parquet.exists():
+        origens = [Path(__file__)] + ([arquivo_csv] if arquivo_csv.exists() else [])
+        if arquivo_parquet.stat().st_mtime >= max(o.stat().st_mtime for o in origens):
+            try:
+                return pd.read_parquet(arquivo_parquet)
+            except (OSError, ValueError):
+                pass  # Cópia corrompida ou ilegível: recarrega do CSV (e a regrava)
+    
     try:
-        df = pd.read_csv('dataset_vendas_completo.csv')
-        df['data'] = pd.to_datetime(df['data'])
+        df = pd.read_csv(
+            arquivo_csv,
+            engine='pyarrow',
+            parse_dates=['data'],
+            dtype={
+                'regiao': 'category',
+                'produto': 'category',
+                'categoria': 'category',
+                'ano': 'int16',
+                'mes': 'int8',
+                'trimestre': 'category',
+                'quantidade_vendida': 'int32',
+                'preco_unitario': 'float32',
+                'custo_unitario': 'float32',
+                'lucro_bruto': 'float32',
+                'faturamento': 'float64',  # somado em todas as páginas: float32 perde os centavos
+                'margem_lucro': 'float32',
+                'ticket_medio': 'float32'
+            }
+        )
         
         # Criar features adicionais
-        df['ano_mes'] = df['data'].dt.to_period('M').astype(str)
-        df['semestre'] = df['data'].dt.month.apply(lambda x: 'S1' if x <= 6 else 'S2')
-        df['ano_semestre'] = df['ano'].astype(str) + '-' + df['semestre']
-        df['roi'] = ((df['lucro_bruto'] / (df['custo_unitario'] * df['quantidade_vendida'])) * 100).round(2)
+        df['ano_mes'] = df['data'].to_numpy().astype('datetime64[M]')  # início do mês
+        mes = df['data'].dt.month.values
+        df['semestre'] = SEMESTRE_POR_MES[mes - 1]
+        
+        # ano_semestre por aritmética de códigos: (ano - primeiro_ano) * 2 + (mês > 6)
+        ano = df['ano'].to_numpy()
+        primeiro_ano, ultimo_ano = int(ano.min()), int(ano.max())
+        df['ano_semestre'] = pd.Categorical.from_codes(
+            (ano - primeiro_ano) * 2 + (mes > 6),
+            categories=[f"{a}-S{s}" for a in range(primeiro_ano, ultimo_ano + 1) for s in (1, 2)]
+        )
+        
+        # ROI (%) calculado em um único buffer float32 pré-alocado (custo zero -> ROI 0)
+        roi = np.empty(len(df), dtype=np.float32)
+        np.multiply(df['custo_unitario'].to_numpy(), df['quantidade_vendida'].to_numpy(), out=roi)
+        np.divide(df['lucro_bruto'].to_numpy(), roi, out=roi, where=roi != 0)
+        roi *= 100
+        df['roi'] = roi
+        
+        # Colunas de baixa cardinalidade como categóricas (filtros e agrupamentos por código)
+        df['semestre'] = df['semestre'].astype('category')
+        
+        # Grava em um arquivo temporário de nome único e o move de uma vez para o destino,
+        # para que gravações interrompidas ou simultâneas nunca deixem uma cópia truncada
+        arquivo_tmp = arquivo_parquet.with_name(f"{arquivo_parquet.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            df.to_parquet(arquivo_tmp, compression='zstd')
+            os.replace(arquivo_tmp, arquivo_parquet)
+        except OSError:
+            pass  # Sem permissão de escrita: segue apenas com o CSV
+        finally:
+            arquivo_tmp.unlink(missing_ok=True)
         
         return df
     except FileNotFoundError:
         st.error("⚠️ Arquivo 'dataset_vendas_completo.csv' não encontrado. Por favor, gere o dataset primeiro.")
         return None
 
-def calcular_metricas_principais(df):
-    """Calcula as métricas principais do dashboard"""
-    faturamento_total = df['faturamento'].sum()
+@st.cache_resource
+def carregar_logo():
+    """Baixa o logo da sidebar uma única vez por processo (None se indisponível)"""
+    try:
+        resposta = requests.get(LOGO_URL, timeout=2)
+        resposta.raise_for_status()
+        return resposta.content
+    except requests.RequestException:
+        return None
+
+def opcoes_filtro(df, col, versao):
+    """Valores disponíveis de uma coluna para os filtros da sidebar"""
+    # Categóricas já trazem os valores nas categorias: leitura direta, sem varrer as linhas
+    if isinstance(df[col].dtype, pd.CategoricalDtype):
+        return tuple(df[col].cat.categories)
+    return valores_ordenados(df, col, versao)
+
+@st.cache_data
+def valores_ordenados(_df, col, versao):
+    """Valores únicos ordenados de uma coluna; chaveado pela coluna e pela versão dos dados"""
+    return tuple(sorted(_df[col].unique()))
+
+# Indexação e filtro recebem a tabela como _df (sem hash) e são chaveados pela
+# versão dos dados e pelo nome da tabela ('vendas' ou 'cubo'), como os demais
+# caches do dataset completo
+
+@st.cache_resource
+def indexar_dados(_df, versao, tabela):
+    """Indexa a tabela pelas colunas de filtro (ano, região, produto), uma vez por versão"""
+    return _df.set_index(['ano', 'regiao', 'produto']).sort_index()
+
+@st.cache_data
+def filtrar_dados(_df_indexado, versao, tabela, anos, regioes, produtos):
+    """Aplica os filtros globais; chaveado pela versão, pela tabela e pelas tuplas de seleção"""
+    return _df_indexado.loc[(list(anos), list(regioes), list(produtos)), :].reset_index()
+
+def agrupar(df, *chaves, **kwargs):
+    """groupby com observed=True por padrão (evita o produto cartesiano de categorias)"""
+    kwargs.setdefault('observed', True)
+    return df.groupby(chaves[0] if len(chaves) == 1 else list(chaves), **kwargs)
+
+@st.cache_data
+def calcular_metricas_principais(cubo):
+    """Calcula as métricas principais do dashboard a partir do cubo filtrado"""
+    # Faturamento por ano em uma única passada
+    por_ano = agrupar(cubo, 'ano')['faturamento'].sum()
+    faturamento_total = por_ano.sum()
     
-    # Crescimento YoY
-    faturamento_2023 = df[df['ano'] == 2023]['faturamento'].sum()
-    faturamento_2024 = df[df['ano'] == 2024]['faturamento'].sum()
-    crescimento_yoy = ((faturamento_2024 - faturamento_2023) / faturamento_2023) * 100
+    # Crescimento YoY (NaN quando 2023 não está na seleção, ex.: filtros vazios)
+    faturamento_2023 = por_ano.get(2023, 0.0)
+    faturamento_2024 = por_ano.get(2024, 0.0)
+    if faturamento_2023:
+        crescimento_yoy = ((faturamento_2024 - faturamento_2023) / faturamento_2023) * 100
+    else:
+        crescimento_yoy = np.nan
     
-    # Outras métricas
-    margem_media = df['margem_lucro'].mean()
-    ticket_medio = df['ticket_medio'].mean()
-    volume_total = df['quantidade_vendida'].sum()
+    # Outras métricas: médias por registro reconstituídas a partir das somas do cubo
+    somas = cubo[['margem_soma', 'ticket_soma', 'quantidade_vendida', 'registros']].sum()
+    margem_media = somas['margem_soma'] / somas['registros']
+    ticket_medio = somas['ticket_soma'] / somas['registros']
+    volume_total = int(somas['quantidade_vendida'])
     
     return {
         'faturamento_total': faturamento_total,
@@ -103,1236 +344,1435 @@ def calcular_metricas_principais(df):
         'faturamento_2024': faturamento_2024
     }
 
-# =============================================================================
-# SIDEBAR - NAVEGAÇÃO E FILTROS
-# =============================================================================
-
-st.sidebar.image("https://via.placeholder.com/300x100/2E86AB/FFFFFF?text=CRISP-DM+Dashboard", use_column_width=True)
-st.sidebar.title("🔄 Metodologia CRISP-DM")
-st.sidebar.markdown("---")
+@st.cache_resource
+def montar_cubo(_df, versao):
+    """Pré-agrega o dataset por data, produto e região (cubo servido a todas as páginas)
+    
+    Médias são guardadas como soma + número de registros, para que possam ser
+    reagregadas em qualquer nível sem distorção. Chaveado pela versão dos dados
+    (o dataset em _df não é hasheado).
+    """
+    # Somas acumuladas em float64 (colunas guardadas em float32 perderiam precisão ao somar)
+    dados = _df[
+        ['ano', 'mes', 'data', 'produto', 'regiao', 'categoria', 'faturamento',
+         'quantidade_vendida', 'margem_lucro', 'preco_unitario', 'ticket_medio']
+    ].astype({'faturamento': 'float64', 'margem_lucro': 'float64',
+              'preco_unitario': 'float64', 'ticket_medio': 'float64'})
+    return agrupar(dados, 'ano', 'mes', 'data', 'produto', 'regiao', 'categoria', as_index=False).agg(
+        faturamento=('faturamento', 'sum'),
+        quantidade_vendida=('quantidade_vendida', 'sum'),
+        margem_soma=('margem_lucro', 'sum'),
+        preco_soma=('preco_unitario', 'sum'),
+        ticket_soma=('ticket_medio', 'sum'),
+        registros=('faturamento', 'size')
+    )
 
-# Menu de navegação
-pagina = st.sidebar.selectbox(
-    "Selecione a Fase:",
-    [
-        "📚 Visão Geral",
-        "1️⃣ Business Understanding",
-        "2️⃣ Data Understanding",
-        "3️⃣ Data Preparation",
-        "4️⃣ Modeling & Analysis",
-        "5️⃣ Evaluation",
-        "6️⃣ Deployment",
-        "🎓 Conceitos de Visualização"
-    ]
-)
+@st.cache_data(ttl=3600)
+def resumir_por(cubo, *chaves):
+    """Faturamento, volume, margem média e preço médio agrupados pelas chaves"""
+    resumo = agrupar(cubo, *chaves)[
+        ['faturamento', 'quantidade_vendida', 'margem_soma', 'preco_soma', 'registros']
+    ].sum()
+    registros = resumo.pop('registros')
+    resumo['margem_lucro'] = resumo.pop('margem_soma') / registros
+    resumo['preco_unitario'] = resumo.pop('preco_soma') / registros
+    return resumo
 
-st.sidebar.markdown("---")
+@st.cache_data(ttl=3600)
+def resumir_produtos(cubo):
+    """Resumo por produto ordenado por faturamento (decrescente), compartilhado entre as páginas"""
+    return resumir_por(cubo, 'produto').sort_values('faturamento', ascending=False)
 
-# Carregar dados
-df = carregar_dados()
+@st.cache_data(ttl=3600)
+def agregar_vendas_mensais(cubo):
+    """Faturamento, volume e margem média por data"""
+    return resumir_por(cubo, 'data')[['faturamento', 'quantidade_vendida', 'margem_lucro']].reset_index()
 
-if df is not None:
-    # Filtros globais
-    st.sidebar.subheader("🔍 Filtros Globais")
+@st.cache_data(ttl=3600)
+def pivotar_produto_regiao(cubo):
+    """Faturamento total e margem média por produto (linhas) e região (colunas)
     
-    # Filtro de período
-    anos_disponiveis = sorted(df['ano'].unique())
-    anos_selecionados = st.sidebar.multiselect(
-        "Anos:",
-        anos_disponiveis,
-        default=anos_disponiveis
+    Devolve uma matriz por métrica; com a seleção vazia as matrizes ficam vazias
+    (o unstack de um resumo vazio perderia o nível das métricas nas colunas).
+    """
+    resumo = resumir_por(cubo, 'produto', 'regiao')
+    return {col: resumo[col].unstack('regiao') for col in ('faturamento', 'margem_lucro')}
+
+@st.cache_data(ttl=3600)
+def agregar_vendas_por_mes(cubo):
+    """Faturamento médio (por registro) em cada mês do ano, via bincount nas chaves 1..12"""
+    mes = cubo['mes'].to_numpy()
+    somas = np.bincount(mes, weights=cubo['faturamento'].to_numpy(), minlength=13)
+    registros = np.bincount(mes, weights=cubo['registros'].to_numpy(), minlength=13)
+    return pd.DataFrame({
+        'mes': np.arange(1, 13),
+        'faturamento': somas[1:] / np.maximum(registros[1:], 1)
+    })
+
+@st.cache_data(ttl=3600)
+def agregar_vendas_por_trimestre(cubo):
+    """Faturamento total por trimestre, via bincount no trimestre derivado do mês"""
+    trimestre = (cubo['mes'].to_numpy() - 1) // 3
+    somas = np.bincount(trimestre, weights=cubo['faturamento'].to_numpy(), minlength=4)
+    return pd.DataFrame({'trimestre': ['Q1', 'Q2', 'Q3', 'Q4'], 'faturamento': somas})
+
+@st.cache_data(ttl=3600)
+def estatisticas_descritivas(df, colunas):
+    """Mesma tabela do describe(); os quartis saem de uma única chamada np.quantile para todas as colunas"""
+    dados = df[list(colunas)]
+    if dados.empty:
+        return dados.describe()
+    quartis = np.quantile(dados.to_numpy(dtype=np.float64), [0.25, 0.5, 0.75], axis=0)
+    return pd.DataFrame(
+        np.vstack([
+            dados.count(),
+            dados.mean(),
+            dados.std(),
+            dados.min(),
+            quartis,
+            dados.max()
+        ]),
+        index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'],
+        columns=list(colunas)
+    )
+
+@st.cache_data(ttl=3600)
+def calcular_qualidade(df):
+    """Valores nulos, linhas duplicadas e completude (%) em uma única verificação"""
+    n_nulos = int(df.isnull().to_numpy().sum())
+    n_duplicadas = int(df.duplicated().sum())
+    completude = (1 - n_nulos / (len(df) * len(df.columns))) * 100
+    return n_nulos, n_duplicadas, completude
+
+# As funções abaixo recebem o dataset completo como _df (sem hash) e são
+# chaveadas pela mesma versão usada em carregar_dados, evitando o hash de
+# todas as linhas a cada rerun
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def calcular_kpis_avaliacao(_df, versao):
+    """Margem média, ROI médio e faturamento por ano usados na página de avaliação"""
+    # Garante float32 nas colunas das médias (sem cópia quando o carregamento já as converteu);
+    # o faturamento segue em float64 para que as somas mantenham os centavos
+    valores = _df[['ano', 'margem_lucro', 'roi', 'faturamento']].astype(
+        {'margem_lucro': 'float32', 'roi': 'float32'}, copy=False
     )
     
-    # Filtro de região
-    regioes_disponiveis = sorted(df['regiao'].unique())
-    regioes_selecionadas = st.sidebar.multiselect(
-        "Regiões:",
-        regioes_disponiveis,
-        default=regioes_disponiveis
+    # Médias das duas colunas em uma única chamada
+    medias = valores.agg({'margem_lucro': 'mean', 'roi': 'mean'})
+    por_ano = agrupar(valores, 'ano')['faturamento'].sum()
+    
+    # Apenas os escalares exibidos voltam como float do Python
+    return {
+        'margem': float(medias['margem_lucro']),
+        'roi': float(medias['roi']),
+        'faturamento_por_ano': {int(ano): float(total) for ano, total in por_ano.items()}
+    }
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def preparar_antes_depois(_df, versao):
+    """Top 5 produtos por faturamento para o exemplo 'Antes vs Depois': original, ordenado e cores"""
+    top5 = agrupar(_df, 'produto', sort=False)['faturamento'].sum().nlargest(5)
+    
+    # 'Antes' na ordem das categorias (sem ranking, para manter o contraste); 'depois' ordenado
+    dados_exemplo = top5.sort_index()
+    dados_sorted = top5.sort_values(ascending=True)
+    
+    # Extremos calculados uma vez, fora da compreensão
+    vmax = dados_sorted.max()
+    vmin = dados_sorted.min()
+    cores = [CORES['sucesso'] if v == vmax else 
+            CORES['destaque'] if v == vmin else 
+            CORES['neutro'] for v in dados_sorted.values]
+    return dados_exemplo, dados_sorted, cores
+
+def formatar_milhoes(valores, casas=1):
+    """Rótulos 'R$ X.XM' para um array de valores em reais (formatação vetorizada)"""
+    milhoes = np.char.mod(f'%.{casas}f', np.asarray(valores, dtype=np.float64) / 1e6)
+    return np.char.add(np.char.add('R$ ', milhoes), 'M')
+
+def formatar_percentual(valores, casas=1):
+    """Rótulos 'X.X%' para um array de percentuais (formatação vetorizada)"""
+    return np.char.add(np.char.mod(f'%.{casas}f', np.asarray(valores, dtype=np.float64)), '%')
+
+def lista_html(itens, marcador):
+    """Lista de itens, um por linha, precedidos pelo marcador (emoji) da categoria"""
+    return "".join(f"<div>{marcador} {item}</div>" for item in itens)
+
+def trace_linha(x, y, **kwargs):
+    """Trace de série temporal; usa WebGL (Scattergl) para séries longas"""
+    import plotly.graph_objects as go
+    
+    tipo_trace = go.Scattergl if len(x) > LIMITE_WEBGL_LINHA else go.Scatter
+    return tipo_trace(x=x, y=y, **kwargs)
+
+def decimar_serie(x, y, max_pontos=LIMITE_PONTOS_SERIE):
+    """Reduz uma série longa a no máximo max_pontos (primeiro x e média de y de cada bloco)"""
+    if len(x) <= max_pontos:
+        return x, y
+    inicios = np.arange(0, len(x), -(-len(x) // max_pontos))
+    tamanhos = np.diff(np.append(inicios, len(x)))
+    return x[inicios], np.add.reduceat(y, inicios) / tamanhos
+
+def heatmap_matriz(matriz, casas=1, **kwargs):
+    """Heatmap de uma matriz (ex.: produto x região), com os valores escritos nas células"""
+    import plotly.graph_objects as go
+    
+    return go.Figure(data=go.Heatmap(
+        z=matriz.to_numpy(dtype=np.float32),
+        x=matriz.columns.to_numpy(),
+        y=matriz.index.to_numpy(),
+        text=matriz.to_numpy().round(casas),
+        textfont={"size": 12},
+        **kwargs
+    ))
+
+@st.cache_resource
+def figura_demo_cor():
+    """Demonstração estática do atributo pré-atentivo cor (construída uma única vez)"""
+    import plotly.graph_objects as go
+    
+    fig_cor = go.Figure(data=[
+        go.Bar(
+            x=['A', 'B', 'C', 'D', 'E'],
+            y=[10, 15, 13, 17, 9],
+            marker_color=[CORES['neutro'], CORES['neutro'], CORES['destaque'], 
+                         CORES['neutro'], CORES['neutro']]
+        )
+    ])
+    fig_cor.update_layout(
+        title="Cor direciona atenção instantaneamente",
+        showlegend=False,
+        height=300
     )
+    return fig_cor
+
+@st.cache_resource
+def figura_demo_tamanho():
+    """Demonstração estática do atributo pré-atentivo tamanho (construída uma única vez)"""
+    import plotly.graph_objects as go
     
-    # Filtro de produto
-    produtos_disponiveis = sorted(df['produto'].unique())
-    produtos_selecionados = st.sidebar.multiselect(
-        "Produtos:",
-        produtos_disponiveis,
-        default=produtos_disponiveis
+    fig_tamanho = go.Figure(data=[
+        go.Scattergl(
+            x=[1, 2, 3, 4, 5],
+            y=[1, 1, 1, 1, 1],
+            mode='markers',
+            marker=dict(
+                size=[10, 20, 50, 30, 15],
+                color=CORES['principal']
+            )
+        )
+    ])
+    fig_tamanho.update_layout(
+        title="Tamanho indica magnitude",
+        showlegend=False,
+        height=300,
+        xaxis=dict(showticklabels=False),
+        yaxis=dict(showticklabels=False)
     )
+    return fig_tamanho
+
+@st.cache_resource
+def figura_matriz_priorizacao():
+    """Matriz impacto x esforço das iniciativas (dados fixos; figura construída uma única vez)"""
+    import plotly.graph_objects as go
     
-    # Aplicar filtros
-    df_filtrado = df[
-        (df['ano'].isin(anos_selecionados)) &
-        (df['regiao'].isin(regioes_selecionadas)) &
-        (df['produto'].isin(produtos_selecionados))
-    ]
+    iniciativas = {
+        'Expansão Regional': {'impacto': 8, 'esforco': 7},
+        'Novos Produtos': {'impacto': 6, 'esforco': 9},
+        'Otimização Margem': {'impacto': 9, 'esforco': 5},
+        'Marketing Digital': {'impacto': 5, 'esforco': 6},
+        'Automação': {'impacto': 7, 'esforco': 4},
+        'Fidelização': {'impacto': 6, 'esforco': 3},
+        'Parcerias': {'impacto': 4, 'esforco': 8}
+    }
     
-    # Calcular métricas
-    metricas = calcular_metricas_principais(df_filtrado)
+    # Arrays paralelos para um único trace com todas as iniciativas
+    nomes = np.array(list(iniciativas))
+    esforcos = np.array([valores['esforco'] for valores in iniciativas.values()])
+    impactos = np.array([valores['impacto'] for valores in iniciativas.values()])
+    
+    # Quadrante de cada iniciativa como chave de 2 bits (impacto alto, esforço alto)
+    quadrantes = (impactos >= 5) * 2 + (esforcos >= 5)
+    cores = np.take(COR_QUADRANTE, quadrantes)
+    simbolos = np.take(SIMBOLO_QUADRANTE, quadrantes)
+    
+    fig_matriz = go.Figure(go.Scatter(
+        x=esforcos,
+        y=impactos,
+        mode='markers+text',
+        text=nomes,
+        textposition='top center',
+        marker=dict(size=20, color=cores, symbol=simbolos),
+        showlegend=False
+    ))
+    
+    # Adicionar quadrantes
+    fig_matriz.add_hline(y=5, line_dash="dash", line_color="gray", opacity=0.5)
+    fig_matriz.add_vline(x=5, line_dash="dash", line_color="gray", opacity=0.5)
+    
+    # Adicionar labels dos quadrantes
+    fig_matriz.add_annotation(x=2.5, y=8, text="Quick Wins", showarrow=False, font=dict(size=12, color="green"))
+    fig_matriz.add_annotation(x=7.5, y=8, text="Estratégico", showarrow=False, font=dict(size=12, color="blue"))
+    fig_matriz.add_annotation(x=2.5, y=2, text="Baixa Prioridade", showarrow=False, font=dict(size=12, color="gray"))
+    fig_matriz.add_annotation(x=7.5, y=2, text="Repensar", showarrow=False, font=dict(size=12, color="orange"))
+    
+    fig_matriz.update_layout(
+        title="Matriz de Priorização (Impacto vs Esforço)",
+        xaxis_title="Esforço →",
+        yaxis_title="Impacto →",
+        xaxis=dict(range=[0, 10]),
+        yaxis=dict(range=[0, 10]),
+        height=500
+    )
+    
+    return fig_matriz
 
 # =============================================================================
-# CONTEÚDO PRINCIPAL - BASEADO NA PÁGINA SELECIONADA
+# PÁGINAS DO DASHBOARD
 # =============================================================================
+# Cada página é um fragmento: widgets internos (ex.: seletor de análise) só
+# reexecutam a própria página, não a sidebar nem as demais agregações.
+# Os módulos do Plotly são importados dentro das páginas que desenham gráficos,
+# para que as páginas só de texto não paguem esse custo de importação.
 
-if df is None:
-    st.error("Não foi possível carregar os dados. Verifique se o arquivo existe.")
-else:
-    # PÁGINA: VISÃO GERAL
-    if pagina == "📚 Visão Geral":
-        st.title("📊 Dashboard de Análise de Vendas - Metodologia CRISP-DM")
-        st.markdown("### Aplicando Conceitos de Visualização e Percepção Visual")
+# PÁGINA: VISÃO GERAL
+@st.fragment
+def pagina_visao_geral(metricas, cubo_filtrado):
+    """Visão geral: métricas principais, evolução do faturamento e top produtos"""
+    import plotly.graph_objects as go
+    
+    st.title("📊 Dashboard de Análise de Vendas - Metodologia CRISP-DM")
+    st.markdown("### Aplicando Conceitos de Visualização e Percepção Visual")
+    
+    # Métricas principais em cards
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            label="💰 Faturamento Total",
+            value=f"R$ {metricas['faturamento_total']/1e6:.1f}M",
+            delta=f"{metricas['crescimento_yoy']:.1f}% YoY"
+        )
+    
+    with col2:
+        st.metric(
+            label="📈 Crescimento YoY",
+            value=f"{metricas['crescimento_yoy']:.1f}%",
+            delta="Meta: 15%"
+        )
+    
+    with col3:
+        st.metric(
+            label="💹 Margem Média",
+            value=f"{metricas['margem_media']:.1f}%",
+            delta="Meta: 35%"
+        )
+    
+    with col4:
+        st.metric(
+            label="🎯 Ticket Médio",
+            value=f"R$ {metricas['ticket_medio']:.0f}",
+            delta=f"{metricas['volume_total']:,} vendas"
+        )
+    
+    st.markdown("---")
+    
+    # Gráficos principais
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Evolução temporal
+        vendas_mensais = agregar_vendas_mensais(cubo_filtrado)
+        
+        # Séries muito longas são decimadas no servidor antes de ir ao navegador
+        datas, faturamento = decimar_serie(
+            vendas_mensais['data'].to_numpy(),
+            vendas_mensais['faturamento'].to_numpy(dtype=np.float32)
+        )
+        
+        fig_temporal = go.Figure()
+        fig_temporal.add_trace(trace_linha(
+            x=datas,
+            y=faturamento,
+            mode='lines+markers',
+            name='Faturamento',
+            line=dict(color=CORES['principal'], width=3),
+            fill='tozeroy',
+            fillcolor='rgba(46, 134, 171, 0.2)'
+        ))
+        
+        fig_temporal.update_layout(
+            title="📈 Evolução do Faturamento Mensal",
+            xaxis_title="Período",
+            yaxis_title="Faturamento (R$)",
+            hovermode='x unified',
+            showlegend=False,
+            height=400
+        )
+        
+        st.plotly_chart(fig_temporal, use_container_width=True)
+    
+    with col2:
+        # Top produtos
+        top_produtos = resumir_produtos(cubo_filtrado)['faturamento'].head(5)
+        
+        fig_produtos = go.Figure(data=[
+            go.Bar(
+                x=top_produtos.to_numpy(dtype=np.float32),
+                y=top_produtos.index.to_numpy(),
+                orientation='h',
+                marker_color=[CORES['sucesso'], CORES['principal'], CORES['secundaria'], 
+                             CORES['alerta'], CORES['neutro']][:len(top_produtos)]
+            )
+        ])
+        
+        fig_produtos.update_layout(
+            title="🏆 Top 5 Produtos por Faturamento",
+            xaxis_title="Faturamento (R$)",
+            yaxis_title="",
+            height=400
+        )
+        
+        st.plotly_chart(fig_produtos, use_container_width=True)
+    
+    # Tabela resumo
+    st.markdown("### 📊 Resumo por Categoria")
+    resumo_categoria = resumir_por(cubo_filtrado, 'categoria')[
+        ['faturamento', 'quantidade_vendida', 'margem_lucro']
+    ].round(2)
+    resumo_categoria['faturamento'] /= 1e6
+    st.dataframe(
+        resumo_categoria.style.format({
+            'faturamento': 'R$ {:.2f}M',
+            'quantidade_vendida': '{:,.0f}',
+            'margem_lucro': '{:.2f}'
+        }),
+        use_container_width=True
+    )
+
+# PÁGINA: BUSINESS UNDERSTANDING
+@st.fragment
+def pagina_business_understanding():
+    """Fase 1: contexto, objetivos e perguntas de negócio"""
+    st.title("1️⃣ FASE 1: Business Understanding")
+    st.markdown("### Entendimento do Negócio e Definição de Objetivos")
+    
+    # Contexto
+    with st.expander("🏢 Contexto do Negócio", expanded=True):
+        st.markdown("""
+        **Empresa de Tecnologia em Expansão**
+        
+        A empresa comercializa produtos eletrônicos e acessórios em todo o Brasil, 
+        operando em 5 regiões com 5 produtos principais. Busca otimizar suas 
+        estratégias comerciais baseadas em dados.
+        
+        **Desafios Atuais:**
+        - Maximizar receita em um mercado competitivo
+        - Otimizar o mix de produtos
+        - Expandir presença regional
+        - Antecipar e aproveitar sazonalidades
+        """)
+    
+    # Objetivos e KPIs
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### 🎯 Objetivos Estratégicos")
+        objetivos = [
+            "Maximizar Receita",
+            "Otimizar Mix de Produtos", 
+            "Expansão Regional",
+            "Planejamento Sazonal"
+        ]
+        for obj in objetivos:
+            st.success(f"✅ {obj}")
+    
+    with col2:
+        st.markdown("### 📊 KPIs de Sucesso")
+        kpis = {
+            "Crescimento de Receita": "15% YoY",
+            "Margem de Lucro": "> 35%",
+            "Penetração Regional": "+20% regiões baixas",
+            "ROI de Produtos": "> 25%"
+        }
+        for kpi, meta in kpis.items():
+            st.info(f"📈 {kpi}: {meta}")
+    
+    # Perguntas de negócio
+    st.markdown("### ❓ Perguntas-Chave do Negócio")
+    
+    perguntas = [
+        "Qual é a tendência geral de faturamento da empresa?",
+        "Quais produtos/categorias geram maior receita e lucro?",
+        "Como o desempenho varia entre as regiões?",
+        "Existem padrões sazonais que devemos considerar?",
+        "Qual é a evolução da margem de lucro?",
+        "Quais combinações produto-região são mais promissoras?"
+    ]
+    
+    for i, pergunta in enumerate(perguntas, 1):
+        st.markdown(f"{i}. {pergunta}")
+
+# PÁGINA: DATA UNDERSTANDING
+@st.fragment
+def pagina_data_understanding(df_filtrado, cubo_filtrado, agregados):
+    """Fase 2: estatísticas, qualidade e distribuição dos dados"""
+    import plotly.express as px
+    import plotly.graph_objects as go
+    
+    st.title("2️⃣ FASE 2: Data Understanding")
+    st.markdown("### Exploração e Entendimento dos Dados")
+    
+    # Informações gerais
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("📊 Total de Registros", f"{len(df_filtrado):,}")
+    with col2:
+        st.metric("📅 Período", f"{df_filtrado['data'].min().strftime('%m/%Y')} - {df_filtrado['data'].max().strftime('%m/%Y')}")
+    with col3:
+        st.metric("🔢 Variáveis", len(df_filtrado.columns))
+    
+    # Tabs para diferentes visualizações
+    tab1, tab2, tab3, tab4 = st.tabs(["📈 Estatísticas", "🔍 Qualidade", "📊 Distribuições", "💡 Demo Visual"])
+    
+    with tab1:
+        st.markdown("### Estatísticas Descritivas")
+        stats_df = estatisticas_descritivas(
+            df_filtrado, ('quantidade_vendida', 'preco_unitario', 'faturamento', 'margem_lucro')
+        )
+        st.dataframe(stats_df.style.format("{:.2f}"), use_container_width=True)
+    
+    with tab2:
+        st.markdown("### Verificação de Qualidade dos Dados")
+        col1, col2 = st.columns(2)
         
-        # Métricas principais em cards
-        col1, col2, col3, col4 = st.columns(4)
+        n_nulos, n_duplicadas, completude = calcular_qualidade(df_filtrado)
         
         with col1:
-            st.metric(
-                label="💰 Faturamento Total",
-                value=f"R$ {metricas['faturamento_total']/1e6:.1f}M",
-                delta=f"{metricas['crescimento_yoy']:.1f}% YoY"
+            st.metric("Valores Nulos", n_nulos)
+            st.metric("Linhas Duplicadas", n_duplicadas)
+        
+        with col2:
+            st.metric("Completude dos Dados", f"{completude:.1f}%")
+            st.metric("Produtos Únicos", df_filtrado['produto'].nunique())
+    
+    with tab3:
+        st.markdown("### Distribuição dos Dados")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Distribuição por categoria
+            fig_cat = px.pie(
+                agrupar(cubo_filtrado, 'categoria')['faturamento'].sum().reset_index(),
+                values='faturamento',
+                names='categoria',
+                title="Distribuição por Categoria"
             )
+            st.plotly_chart(fig_cat, use_container_width=True)
         
         with col2:
-            st.metric(
-                label="📈 Crescimento YoY",
-                value=f"{metricas['crescimento_yoy']:.1f}%",
-                delta="Meta: 15%"
+            # Distribuição por região
+            fig_reg = px.bar(
+                agregados['por_regiao'].reset_index(),
+                x='regiao',
+                y='faturamento',
+                title="Faturamento por Região",
+                color='faturamento',
+                color_continuous_scale='Viridis'
             )
+            st.plotly_chart(fig_reg, use_container_width=True)
+    
+    with tab4:
+        st.markdown("### 💡 Demonstração: O Poder da Visualização")
+        st.info("🧠 **Fato:** O cérebro processa imagens 60.000x mais rápido que texto!")
         
-        with col3:
-            st.metric(
-                label="💹 Margem Média",
-                value=f"{metricas['margem_media']:.1f}%",
-                delta="Meta: 35%"
+        # Comparação tabela vs gráfico
+        col1, col2 = st.columns(2)
+        
+        vendas_demo = agregados['por_mes'].head(12)
+        
+        with col1:
+            st.markdown("#### 📋 Dados em Tabela")
+            tabela_demo = pd.DataFrame({
+                'Mês': range(1, len(vendas_demo)+1),
+                'Faturamento': vendas_demo.to_numpy() / 1e6
+            })
+            st.dataframe(
+                tabela_demo.style.format({'Faturamento': 'R$ {:.2f}M'}),
+                use_container_width=True,
+                height=400
             )
         
-        with col4:
-            st.metric(
-                label="🎯 Ticket Médio",
-                value=f"R$ {metricas['ticket_medio']:.0f}",
-                delta=f"{metricas['volume_total']:,} vendas"
+        with col2:
+            st.markdown("#### 📈 Mesmos Dados em Gráfico")
+            fig_demo = go.Figure()
+            fig_demo.add_trace(go.Scatter(
+                x=np.arange(1, len(vendas_demo)+1, dtype=np.int32),
+                y=vendas_demo.to_numpy(dtype=np.float32),
+                mode='lines+markers',
+                line=dict(color=CORES['principal'], width=3),
+                marker=dict(size=10)
+            ))
+            fig_demo.update_layout(
+                xaxis_title="Mês",
+                yaxis_title="Faturamento (R$)",
+                height=400,
+                showlegend=False
             )
+            st.plotly_chart(fig_demo, use_container_width=True)
+        
+        st.success("✅ Note como o gráfico revela instantaneamente: tendências, padrões e magnitude das variações!")
+
+# PÁGINA: DATA PREPARATION
+@st.fragment
+def pagina_data_preparation(cubo_filtrado):
+    """Fase 3: features criadas e níveis de agregação"""
+    st.title("3️⃣ FASE 3: Data Preparation")
+    st.markdown("### Preparação e Transformação dos Dados")
+    
+    # Features criadas
+    st.markdown("### 🔧 Engenharia de Features")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### Features Temporais Criadas:")
+        features_temporais = [
+            "ano_mes - Período mensal",
+            "trimestre - Trimestre do ano",
+            "semestre - Semestre (S1/S2)",
+            "ano_semestre - Combinação ano-semestre"
+        ]
+        for feat in features_temporais:
+            st.write(f"• {feat}")
+    
+    with col2:
+        st.markdown("#### Features de Negócio Criadas:")
+        features_negocio = [
+            "roi - Retorno sobre investimento (%)",
+            "receita_por_unidade - Ticket médio",
+            "classe_faturamento - Classificação por quartis",
+            "eficiência_regional - Índice composto"
+        ]
+        for feat in features_negocio:
+            st.write(f"• {feat}")
+    
+    # Agregações
+    st.markdown("### 📊 Níveis de Agregação Disponíveis")
+    
+    tabs = st.tabs(["Mensal", "Por Produto", "Por Região", "Produto-Região"])
+    
+    with tabs[0]:
+        df_mensal = resumir_por(cubo_filtrado, 'ano', 'mes')[
+            ['faturamento', 'quantidade_vendida', 'margem_lucro']
+        ].round(2).head(10)
+        st.dataframe(df_mensal, use_container_width=True)
+    
+    with tabs[1]:
+        df_produto = resumir_produtos(cubo_filtrado)[
+            ['faturamento', 'quantidade_vendida', 'margem_lucro']
+        ].round(2)
+        st.dataframe(df_produto, use_container_width=True)
+    
+    with tabs[2]:
+        df_regiao = resumir_por(cubo_filtrado, 'regiao')[
+            ['faturamento', 'quantidade_vendida', 'margem_lucro']
+        ].round(2)
+        st.dataframe(df_regiao, use_container_width=True)
+    
+    with tabs[3]:
+        df_prod_reg = pivotar_produto_regiao(cubo_filtrado)['faturamento']
+        
+        # Cores pintadas pelo Plotly no navegador, em vez de um estilo por célula no servidor
+        fig_prod_reg = heatmap_matriz(
+            df_prod_reg,
+            casas=0,
+            colorscale='YlOrRd',
+            texttemplate='%{text:,.0f}',
+            colorbar=dict(title="Faturamento (R$)")
+        )
+        fig_prod_reg.update_layout(
+            title="Faturamento por Produto e Região",
+            height=400
+        )
+        st.plotly_chart(fig_prod_reg, use_container_width=True)
+
+# PÁGINA: MODELING & ANALYSIS
+@st.fragment
+def pagina_modeling(cubo_filtrado):
+    """Fase 4: análises temporal, de produtos, regional e de sazonalidade"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    
+    st.title("4️⃣ FASE 4: Modeling & Analysis")
+    st.markdown("### Análises Avançadas e Visualizações")
+    
+    # Seletor de análise
+    analise = st.selectbox(
+        "Selecione o tipo de análise:",
+        ["Análise Temporal", "Análise de Produtos", "Análise Regional", "Análise de Sazonalidade"]
+    )
+    
+    if analise == "Análise Temporal":
+        st.markdown("### 📈 Análise de Tendência Temporal")
+        
+        # Preparar dados
+        vendas_mensais = agregar_vendas_mensais(cubo_filtrado)
+        
+        # Calcular média móvel
+        vendas_mensais['media_movel_3'] = vendas_mensais['faturamento'].rolling(window=3, center=True).mean()
+        
+        # Criar gráfico
+        fig = make_subplots(
+            rows=2, cols=1,
+            subplot_titles=('Faturamento Mensal com Tendência', 'Volume de Vendas'),
+            vertical_spacing=0.1,
+            row_heights=[0.6, 0.4]
+        )
         
-        st.markdown("---")
+        # Gráfico principal
+        fig.add_trace(
+            trace_linha(
+                x=vendas_mensais['data'].to_numpy(),
+                y=vendas_mensais['faturamento'].to_numpy(dtype=np.float32),
+                mode='lines+markers',
+                name='Faturamento Real',
+                line=dict(color=CORES['principal'], width=2),
+                marker=dict(size=6)
+            ),
+            row=1, col=1
+        )
+        
+        # Média móvel
+        fig.add_trace(
+            trace_linha(
+                x=vendas_mensais['data'].to_numpy(),
+                y=vendas_mensais['media_movel_3'].to_numpy(dtype=np.float32),
+                mode='lines',
+                name='Média Móvel (3 meses)',
+                line=dict(color=CORES['destaque'], width=2, dash='dash')
+            ),
+            row=1, col=1
+        )
+        
+        # Volume
+        fig.add_trace(
+            go.Bar(
+                x=vendas_mensais['data'].to_numpy(),
+                y=vendas_mensais['quantidade_vendida'].to_numpy(),
+                name='Volume',
+                marker_color=CORES['secundaria'],
+                opacity=0.6
+            ),
+            row=2, col=1
+        )
+        
+        fig.update_layout(height=600, showlegend=True, hovermode='x unified')
+        fig.update_xaxes(title_text="Período", row=2, col=1)
+        fig.update_yaxes(title_text="Faturamento (R$)", row=1, col=1)
+        fig.update_yaxes(title_text="Unidades", row=2, col=1)
+        
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Insights
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            crescimento = ((vendas_mensais['faturamento'].iloc[-1] / vendas_mensais['faturamento'].iloc[0]) - 1) * 100
+            st.metric("Crescimento Total", f"{crescimento:.1f}%")
+        with col2:
+            melhor_mes = vendas_mensais.loc[vendas_mensais['faturamento'].idxmax(), 'data'].strftime('%B/%Y')
+            st.metric("Melhor Mês", melhor_mes)
+        with col3:
+            media_mensal = vendas_mensais['faturamento'].mean()
+            st.metric("Média Mensal", f"R$ {media_mensal/1e6:.2f}M")
+    
+    elif analise == "Análise de Produtos":
+        st.markdown("### 💎 Análise Multidimensional de Produtos")
+        
+        # Preparar dados (todas as agregações partem do cubo, de poucas centenas de linhas)
+        df_produtos = resumir_produtos(cubo_filtrado).round(2)
+        matriz_margem = pivotar_produto_regiao(cubo_filtrado)['margem_lucro']
+        categoria_produto = (
+            cubo_filtrado.drop_duplicates('produto').set_index('produto')['categoria']
+            .reindex(df_produtos.index)
+        )
         
-        # Gráficos principais
         col1, col2 = st.columns(2)
         
         with col1:
-            # Evolução temporal
-            vendas_mensais = df_filtrado.groupby('data')['faturamento'].sum().reset_index()
+            # Matriz preço vs volume
+            # Um único trace com todos os produtos (cor pela categoria de cada produto)
+            cores_produto = np.where(
+                categoria_produto.to_numpy() == 'Eletrônicos', CORES['principal'], CORES['secundaria']
+            )
             
-            fig_temporal = go.Figure()
-            fig_temporal.add_trace(go.Scatter(
-                x=vendas_mensais['data'],
-                y=vendas_mensais['faturamento'],
-                mode='lines+markers',
-                name='Faturamento',
-                line=dict(color=CORES['principal'], width=3),
-                fill='tozeroy',
-                fillcolor='rgba(46, 134, 171, 0.2)'
+            fig_scatter = go.Figure(go.Scatter(
+                x=df_produtos['preco_unitario'].to_numpy(dtype=np.float32),
+                y=df_produtos['quantidade_vendida'].to_numpy(dtype=np.float32),
+                mode='markers+text',
+                text=df_produtos.index.to_numpy(),
+                textposition='top center',
+                marker=dict(
+                    size=df_produtos['faturamento'].to_numpy(dtype=np.float32) / 50000,
+                    color=cores_produto,
+                    opacity=0.6,
+                    line=dict(color='white', width=2)
+                )
             ))
             
-            fig_temporal.update_layout(
-                title="📈 Evolução do Faturamento Mensal",
-                xaxis_title="Período",
-                yaxis_title="Faturamento (R$)",
-                hovermode='x unified',
+            fig_scatter.update_layout(
+                title="Matriz Preço vs Volume (tamanho = faturamento)",
+                xaxis_title="Preço Médio (R$)",
+                yaxis_title="Volume Total",
+                xaxis_type="log",
+                yaxis_type="log",
                 showlegend=False,
                 height=400
             )
             
-            st.plotly_chart(fig_temporal, use_container_width=True)
+            st.plotly_chart(fig_scatter, use_container_width=True)
         
         with col2:
-            # Top produtos
-            top_produtos = df_filtrado.groupby('produto')['faturamento'].sum().nlargest(5)
-            
-            fig_produtos = go.Figure(data=[
+            # Margem por produto
+            fig_margem = go.Figure(data=[
                 go.Bar(
-                    x=top_produtos.values,
-                    y=top_produtos.index,
-                    orientation='h',
-                    marker_color=[CORES['sucesso'], CORES['principal'], CORES['secundaria'], 
-                                 CORES['alerta'], CORES['neutro']][:len(top_produtos)]
+                    x=df_produtos.index.to_numpy(),
+                    y=df_produtos['margem_lucro'].to_numpy(dtype=np.float32),
+                    marker_color=[CORES['sucesso'] if m >= 40 else CORES['alerta'] if m >= 35 else CORES['destaque'] 
+                                 for m in df_produtos['margem_lucro']],
+                    text=formatar_percentual(df_produtos['margem_lucro']),
+                    textposition='outside'
                 )
             ])
             
-            fig_produtos.update_layout(
-                title="🏆 Top 5 Produtos por Faturamento",
-                xaxis_title="Faturamento (R$)",
-                yaxis_title="",
+            fig_margem.add_hline(y=40, line_dash="dash", line_color="black", 
+                                annotation_text="Meta: 40%")
+            
+            fig_margem.update_layout(
+                title="Margem de Lucro por Produto",
+                xaxis_title="",
+                yaxis_title="Margem (%)",
+                showlegend=False,
                 height=400
             )
             
-            st.plotly_chart(fig_produtos, use_container_width=True)
-        
-        # Tabela resumo
-        st.markdown("### 📊 Resumo por Categoria")
-        resumo_categoria = df_filtrado.groupby('categoria').agg({
-            'faturamento': 'sum',
-            'quantidade_vendida': 'sum',
-            'margem_lucro': 'mean'
-        }).round(2)
-        resumo_categoria['faturamento'] = resumo_categoria['faturamento'].apply(lambda x: f"R$ {x/1e6:.2f}M")
-        st.dataframe(resumo_categoria, use_container_width=True)
-    
-    # PÁGINA: BUSINESS UNDERSTANDING
-    elif pagina == "1️⃣ Business Understanding":
-        st.title("1️⃣ FASE 1: Business Understanding")
-        st.markdown("### Entendimento do Negócio e Definição de Objetivos")
-        
-        # Contexto
-        with st.expander("🏢 Contexto do Negócio", expanded=True):
-            st.markdown("""
-            **Empresa de Tecnologia em Expansão**
-            
-            A empresa comercializa produtos eletrônicos e acessórios em todo o Brasil, 
-            operando em 5 regiões com 5 produtos principais. Busca otimizar suas 
-            estratégias comerciais baseadas em dados.
-            
-            **Desafios Atuais:**
-            - Maximizar receita em um mercado competitivo
-            - Otimizar o mix de produtos
-            - Expandir presença regional
-            - Antecipar e aproveitar sazonalidades
-            """)
+            st.plotly_chart(fig_margem, use_container_width=True)
         
-        # Objetivos e KPIs
-        col1, col2 = st.columns(2)
+        # Heatmap de performance
+        st.markdown("#### 🎯 Heatmap de Performance Produto-Região")
         
-        with col1:
-            st.markdown("### 🎯 Objetivos Estratégicos")
-            objetivos = [
-                "Maximizar Receita",
-                "Otimizar Mix de Produtos", 
-                "Expansão Regional",
-                "Planejamento Sazonal"
-            ]
-            for obj in objetivos:
-                st.success(f"✅ {obj}")
+        fig_heatmap = heatmap_matriz(
+            matriz_margem,
+            colorscale='RdYlGn',
+            texttemplate='%{text}%',
+            colorbar=dict(title="Margem (%)")
+        )
         
-        with col2:
-            st.markdown("### 📊 KPIs de Sucesso")
-            kpis = {
-                "Crescimento de Receita": "15% YoY",
-                "Margem de Lucro": "> 35%",
-                "Penetração Regional": "+20% regiões baixas",
-                "ROI de Produtos": "> 25%"
-            }
-            for kpi, meta in kpis.items():
-                st.info(f"📈 {kpi}: {meta}")
-        
-        # Perguntas de negócio
-        st.markdown("### ❓ Perguntas-Chave do Negócio")
-        
-        perguntas = [
-            "Qual é a tendência geral de faturamento da empresa?",
-            "Quais produtos/categorias geram maior receita e lucro?",
-            "Como o desempenho varia entre as regiões?",
-            "Existem padrões sazonais que devemos considerar?",
-            "Qual é a evolução da margem de lucro?",
-            "Quais combinações produto-região são mais promissoras?"
-        ]
+        fig_heatmap.update_layout(
+            title="Margem de Lucro Média (%) por Produto e Região",
+            height=400
+        )
         
-        for i, pergunta in enumerate(perguntas, 1):
-            st.markdown(f"{i}. {pergunta}")
+        st.plotly_chart(fig_heatmap, use_container_width=True)
     
-    # PÁGINA: DATA UNDERSTANDING
-    elif pagina == "2️⃣ Data Understanding":
-        st.title("2️⃣ FASE 2: Data Understanding")
-        st.markdown("### Exploração e Entendimento dos Dados")
-        
-        # Informações gerais
-        col1, col2, col3 = st.columns(3)
+    elif analise == "Análise Regional":
+        st.markdown("### 🌍 Análise de Performance Regional")
+        
+        # Preparar dados
+        df_regional = resumir_por(cubo_filtrado, 'regiao')[
+            ['faturamento', 'quantidade_vendida', 'margem_lucro']
+        ].round(2)
+        
+        # Calcular crescimento YoY (faturamento região x ano em uma única passada)
+        por_regiao_ano = agrupar(cubo_filtrado, 'regiao', 'ano')['faturamento'].sum().unstack('ano', fill_value=0)
+        por_regiao_ano = por_regiao_ano.reindex(columns=[2023, 2024], fill_value=0)
+        crescimento_regional = (
+            (por_regiao_ano[2024] - por_regiao_ano[2023]) / por_regiao_ano[2023].replace(0, np.nan) * 100
+        ).fillna(0)
+        
+        # Criar visualizações
+        col1, col2 = st.columns(2)
         
         with col1:
-            st.metric("📊 Total de Registros", f"{len(df_filtrado):,}")
-        with col2:
-            st.metric("📅 Período", f"{df_filtrado['data'].min().strftime('%m/%Y')} - {df_filtrado['data'].max().strftime('%m/%Y')}")
-        with col3:
-            st.metric("🔢 Variáveis", len(df_filtrado.columns))
-        
-        # Tabs para diferentes visualizações
-        tab1, tab2, tab3, tab4 = st.tabs(["📈 Estatísticas", "🔍 Qualidade", "📊 Distribuições", "💡 Demo Visual"])
-        
-        with tab1:
-            st.markdown("### Estatísticas Descritivas")
-            stats_df = df_filtrado[['quantidade_vendida', 'preco_unitario', 'faturamento', 'margem_lucro']].describe()
-            st.dataframe(stats_df.style.format("{:.2f}"), use_container_width=True)
-        
-        with tab2:
-            st.markdown("### Verificação de Qualidade dos Dados")
-            col1, col2 = st.columns(2)
+            # Mapa de intensidade
+            fig_intensidade = go.Figure(data=[
+                go.Bar(
+                    y=df_regional.index.to_numpy(),
+                    x=df_regional['faturamento'].to_numpy(dtype=np.float32),
+                    orientation='h',
+                    marker=dict(
+                        color=df_regional['faturamento'].to_numpy(dtype=np.float32),
+                        colorscale='YlOrRd',
+                        showscale=True,
+                        colorbar=dict(title="Faturamento")
+                    ),
+                    text=formatar_milhoes(df_regional['faturamento']),
+                    textposition='outside'
+                )
+            ])
             
-            with col1:
-                st.metric("Valores Nulos", df_filtrado.isnull().sum().sum())
-                st.metric("Linhas Duplicadas", df_filtrado.duplicated().sum())
+            fig_intensidade.update_layout(
+                title="🗺️ Desempenho por Região",
+                xaxis_title="Faturamento (R$)",
+                yaxis_title="",
+                height=400
+            )
             
-            with col2:
-                completude = (1 - df_filtrado.isnull().sum().sum() / (len(df_filtrado) * len(df_filtrado.columns))) * 100
-                st.metric("Completude dos Dados", f"{completude:.1f}%")
-                st.metric("Produtos Únicos", df_filtrado['produto'].nunique())
+            st.plotly_chart(fig_intensidade, use_container_width=True)
         
-        with tab3:
-            st.markdown("### Distribuição dos Dados")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Distribuição por categoria
-                fig_cat = px.pie(
-                    df_filtrado.groupby('categoria')['faturamento'].sum().reset_index(),
-                    values='faturamento',
-                    names='categoria',
-                    title="Distribuição por Categoria"
-                )
-                st.plotly_chart(fig_cat, use_container_width=True)
-            
-            with col2:
-                # Distribuição por região
-                fig_reg = px.bar(
-                    df_filtrado.groupby('regiao')['faturamento'].sum().reset_index(),
-                    x='regiao',
-                    y='faturamento',
-                    title="Faturamento por Região",
-                    color='faturamento',
-                    color_continuous_scale='Viridis'
+        with col2:
+            # Crescimento YoY
+            fig_crescimento = go.Figure(data=[
+                go.Bar(
+                    y=crescimento_regional.index.to_numpy(),
+                    x=crescimento_regional.to_numpy(dtype=np.float32),
+                    orientation='h',
+                    marker_color=[CORES['sucesso'] if x > 0 else CORES['destaque'] 
+                                 for x in crescimento_regional.values],
+                    text=formatar_percentual(crescimento_regional),
+                    textposition='outside'
                 )
-                st.plotly_chart(fig_reg, use_container_width=True)
-        
-        with tab4:
-            st.markdown("### 💡 Demonstração: O Poder da Visualização")
-            st.info("🧠 **Fato:** O cérebro processa imagens 60.000x mais rápido que texto!")
-            
-            # Comparação tabela vs gráfico
-            col1, col2 = st.columns(2)
-            
-            vendas_demo = df_filtrado.groupby('mes')['faturamento'].sum().head(12)
+            ])
             
-            with col1:
-                st.markdown("#### 📋 Dados em Tabela")
-                tabela_demo = pd.DataFrame({
-                    'Mês': range(1, len(vendas_demo)+1),
-                    'Faturamento': [f"R$ {v/1e6:.2f}M" for v in vendas_demo.values]
-                })
-                st.dataframe(tabela_demo, use_container_width=True, height=400)
+            fig_crescimento.add_vline(x=0, line_width=2, line_color="black")
             
-            with col2:
-                st.markdown("#### 📈 Mesmos Dados em Gráfico")
-                fig_demo = go.Figure()
-                fig_demo.add_trace(go.Scatter(
-                    x=list(range(1, len(vendas_demo)+1)),
-                    y=vendas_demo.values,
-                    mode='lines+markers',
-                    line=dict(color=CORES['principal'], width=3),
-                    marker=dict(size=10)
-                ))
-                fig_demo.update_layout(
-                    xaxis_title="Mês",
-                    yaxis_title="Faturamento (R$)",
-                    height=400,
-                    showlegend=False
-                )
-                st.plotly_chart(fig_demo, use_container_width=True)
+            fig_crescimento.update_layout(
+                title="📈 Crescimento YoY por Região",
+                xaxis_title="Crescimento (%)",
+                yaxis_title="",
+                height=400
+            )
             
-            st.success("✅ Note como o gráfico revela instantaneamente: tendências, padrões e magnitude das variações!")
-    
-    # PÁGINA: DATA PREPARATION
-    elif pagina == "3️⃣ Data Preparation":
-        st.title("3️⃣ FASE 3: Data Preparation")
-        st.markdown("### Preparação e Transformação dos Dados")
+            st.plotly_chart(fig_crescimento, use_container_width=True)
         
-        # Features criadas
-        st.markdown("### 🔧 Engenharia de Features")
+        # Evolução temporal por região
+        st.markdown("#### 📊 Evolução Temporal por Região")
         
-        col1, col2 = st.columns(2)
+        fig_evolucao = go.Figure()
         
-        with col1:
-            st.markdown("#### Features Temporais Criadas:")
-            features_temporais = [
-                "ano_mes - Período mensal",
-                "trimestre - Trimestre do ano",
-                "semestre - Semestre (S1/S2)",
-                "ano_semestre - Combinação ano-semestre"
-            ]
-            for feat in features_temporais:
-                st.write(f"• {feat}")
+        # Faturamento data x região em uma única passada; uma coluna por região
+        por_data_regiao = agrupar(cubo_filtrado, 'data', 'regiao')['faturamento'].sum().unstack('regiao', fill_value=0)
+        datas = por_data_regiao.index.to_numpy()
         
-        with col2:
-            st.markdown("#### Features de Negócio Criadas:")
-            features_negocio = [
-                "roi - Retorno sobre investimento (%)",
-                "receita_por_unidade - Ticket médio",
-                "classe_faturamento - Classificação por quartis",
-                "eficiência_regional - Índice composto"
-            ]
-            for feat in features_negocio:
-                st.write(f"• {feat}")
-        
-        # Agregações
-        st.markdown("### 📊 Níveis de Agregação Disponíveis")
-        
-        tabs = st.tabs(["Mensal", "Por Produto", "Por Região", "Produto-Região"])
-        
-        with tabs[0]:
-            df_mensal = df_filtrado.groupby(['ano', 'mes']).agg({
-                'faturamento': 'sum',
-                'quantidade_vendida': 'sum',
-                'margem_lucro': 'mean'
-            }).round(2).head(10)
-            st.dataframe(df_mensal, use_container_width=True)
-        
-        with tabs[1]:
-            df_produto = df_filtrado.groupby('produto').agg({
-                'faturamento': 'sum',
-                'quantidade_vendida': 'sum',
-                'margem_lucro': 'mean'
-            }).round(2)
-            st.dataframe(df_produto, use_container_width=True)
-        
-        with tabs[2]:
-            df_regiao = df_filtrado.groupby('regiao').agg({
-                'faturamento': 'sum',
-                'quantidade_vendida': 'sum',
-                'margem_lucro': 'mean'
-            }).round(2)
-            st.dataframe(df_regiao, use_container_width=True)
-        
-        with tabs[3]:
-            df_prod_reg = df_filtrado.pivot_table(
-                values='faturamento',
-                index='produto',
-                columns='regiao',
-                aggfunc='sum'
-            ).round(0)
-            st.dataframe(df_prod_reg.style.background_gradient(cmap='YlOrRd'), use_container_width=True)
-    
-    # PÁGINA: MODELING & ANALYSIS
-    elif pagina == "4️⃣ Modeling & Analysis":
-        st.title("4️⃣ FASE 4: Modeling & Analysis")
-        st.markdown("### Análises Avançadas e Visualizações")
-        
-        # Seletor de análise
-        analise = st.selectbox(
-            "Selecione o tipo de análise:",
-            ["Análise Temporal", "Análise de Produtos", "Análise Regional", "Análise de Sazonalidade"]
+        for regiao in por_data_regiao.columns:
+            fig_evolucao.add_trace(trace_linha(
+                x=datas,
+                y=por_data_regiao[regiao].to_numpy(dtype=np.float32),
+                mode='lines',
+                name=regiao,
+                line=dict(width=3 if regiao == 'Sudeste' else 2)
+            ))
+        
+        fig_evolucao.update_layout(
+            title="Evolução do Faturamento por Região",
+            xaxis_title="Período",
+            yaxis_title="Faturamento (R$)",
+            hovermode='x unified',
+            height=400
         )
         
-        if analise == "Análise Temporal":
-            st.markdown("### 📈 Análise de Tendência Temporal")
-            
-            # Preparar dados
-            vendas_mensais = df_filtrado.groupby('data').agg({
-                'faturamento': 'sum',
-                'quantidade_vendida': 'sum',
-                'margem_lucro': 'mean'
-            }).reset_index()
-            
-            # Calcular média móvel
-            vendas_mensais['media_movel_3'] = vendas_mensais['faturamento'].rolling(window=3, center=True).mean()
-            
-            # Criar gráfico
-            fig = make_subplots(
-                rows=2, cols=1,
-                subplot_titles=('Faturamento Mensal com Tendência', 'Volume de Vendas'),
-                vertical_spacing=0.1,
-                row_heights=[0.6, 0.4]
-            )
-            
-            # Gráfico principal
-            fig.add_trace(
-                go.Scatter(
-                    x=vendas_mensais['data'],
-                    y=vendas_mensais['faturamento'],
-                    mode='lines+markers',
-                    name='Faturamento Real',
-                    line=dict(color=CORES['principal'], width=2),
-                    marker=dict(size=6)
-                ),
-                row=1, col=1
-            )
-            
-            # Média móvel
-            fig.add_trace(
-                go.Scatter(
-                    x=vendas_mensais['data'],
-                    y=vendas_mensais['media_movel_3'],
-                    mode='lines',
-                    name='Média Móvel (3 meses)',
-                    line=dict(color=CORES['destaque'], width=2, dash='dash')
-                ),
-                row=1, col=1
-            )
-            
-            # Volume
-            fig.add_trace(
-                go.Bar(
-                    x=vendas_mensais['data'],
-                    y=vendas_mensais['quantidade_vendida'],
-                    name='Volume',
-                    marker_color=CORES['secundaria'],
-                    opacity=0.6
-                ),
-                row=2, col=1
-            )
-            
-            fig.update_layout(height=600, showlegend=True, hovermode='x unified')
-            fig.update_xaxes(title_text="Período", row=2, col=1)
-            fig.update_yaxes(title_text="Faturamento (R$)", row=1, col=1)
-            fig.update_yaxes(title_text="Unidades", row=2, col=1)
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Insights
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                crescimento = ((vendas_mensais['faturamento'].iloc[-1] / vendas_mensais['faturamento'].iloc[0]) - 1) * 100
-                st.metric("Crescimento Total", f"{crescimento:.1f}%")
-            with col2:
-                melhor_mes = vendas_mensais.loc[vendas_mensais['faturamento'].idxmax(), 'data'].strftime('%B/%Y')
-                st.metric("Melhor Mês", melhor_mes)
-            with col3:
-                media_mensal = vendas_mensais['faturamento'].mean()
-                st.metric("Média Mensal", f"R$ {media_mensal/1e6:.2f}M")
-        
-        elif analise == "Análise de Produtos":
-            st.markdown("### 💎 Análise Multidimensional de Produtos")
-            
-            # Preparar dados
-            df_produtos = df_filtrado.groupby('produto').agg({
-                'faturamento': 'sum',
-                'quantidade_vendida': 'sum',
-                'margem_lucro': 'mean',
-                'preco_unitario': 'mean'
-            }).round(2)
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Matriz preço vs volume
-                fig_scatter = go.Figure()
-                
-                for produto in df_produtos.index:
-                    dados_prod = df_filtrado[df_filtrado['produto'] == produto]
-                    categoria = dados_prod['categoria'].iloc[0]
-                    cor = CORES['principal'] if categoria == 'Eletrônicos' else CORES['secundaria']
-                    
-                    fig_scatter.add_trace(go.Scatter(
-                        x=[df_produtos.loc[produto, 'preco_unitario']],
-                        y=[df_produtos.loc[produto, 'quantidade_vendida']],
-                        mode='markers+text',
-                        name=produto,
-                        text=[produto],
-                        textposition='top center',
-                        marker=dict(
-                            size=df_produtos.loc[produto, 'faturamento']/50000,
-                            color=cor,
-                            opacity=0.6,
-                            line=dict(color='white', width=2)
-                        )
-                    ))
-                
-                fig_scatter.update_layout(
-                    title="Matriz Preço vs Volume (tamanho = faturamento)",
-                    xaxis_title="Preço Médio (R$)",
-                    yaxis_title="Volume Total",
-                    xaxis_type="log",
-                    yaxis_type="log",
-                    showlegend=False,
-                    height=400
-                )
-                
-                st.plotly_chart(fig_scatter, use_container_width=True)
-            
-            with col2:
-                # Margem por produto
-                fig_margem = go.Figure(data=[
-                    go.Bar(
-                        x=df_produtos.index,
-                        y=df_produtos['margem_lucro'],
-                        marker_color=[CORES['sucesso'] if m >= 40 else CORES['alerta'] if m >= 35 else CORES['destaque'] 
-                                     for m in df_produtos['margem_lucro']],
-                        text=df_produtos['margem_lucro'].apply(lambda x: f'{x:.1f}%'),
-                        textposition='outside'
-                    )
-                ])
-                
-                fig_margem.add_hline(y=40, line_dash="dash", line_color="black", 
-                                    annotation_text="Meta: 40%")
-                
-                fig_margem.update_layout(
-                    title="Margem de Lucro por Produto",
-                    xaxis_title="",
-                    yaxis_title="Margem (%)",
-                    showlegend=False,
-                    height=400
-                )
-                
-                st.plotly_chart(fig_margem, use_container_width=True)
-            
-            # Heatmap de performance
-            st.markdown("#### 🎯 Heatmap de Performance Produto-Região")
-            
-            matriz_margem = df_filtrado.pivot_table(
-                values='margem_lucro',
-                index='produto',
-                columns='regiao',
-                aggfunc='mean'
-            )
-            
-            fig_heatmap = go.Figure(data=go.Heatmap(
-                z=matriz_margem.values,
-                x=matriz_margem.columns,
-                y=matriz_margem.index,
-                colorscale='RdYlGn',
-                text=matriz_margem.values.round(1),
-                texttemplate='%{text}%',
-                textfont={"size": 12},
-                colorbar=dict(title="Margem (%)")
-            ))
-            
-            fig_heatmap.update_layout(
-                title="Margem de Lucro Média (%) por Produto e Região",
-                height=400
-            )
-            
-            st.plotly_chart(fig_heatmap, use_container_width=True)
+        st.plotly_chart(fig_evolucao, use_container_width=True)
+        
+        # Métricas regionais
+        st.markdown("#### 📊 Métricas Regionais")
+        df_regional['participacao'] = (df_regional['faturamento'] / df_regional['faturamento'].sum() * 100).round(1)
+        df_regional['crescimento_yoy'] = crescimento_regional.round(1)
+        
+        df_display = df_regional[['faturamento', 'participacao', 'margem_lucro', 'crescimento_yoy']].copy()
+        df_display.columns = ['Faturamento', 'Participação (%)', 'Margem (%)', 'Crescimento YoY (%)']
+        df_display['Faturamento'] /= 1e6
+        
+        st.dataframe(
+            df_display.style
+            .background_gradient(subset=['Participação (%)'], cmap='YlOrRd')
+            .format({
+                'Faturamento': 'R$ {:.2f}M',
+                'Participação (%)': '{:.1f}',
+                'Margem (%)': '{:.2f}',
+                'Crescimento YoY (%)': '{:.1f}'
+            }),
+            use_container_width=True
+        )
+    
+    else:  # Análise de Sazonalidade
+        st.markdown("### 📅 Análise de Padrões Sazonais")
+        
+        # Análise por mês
+        vendas_por_mes = agregar_vendas_por_mes(cubo_filtrado)
+        
+        # Criar gráfico de sazonalidade
+        fig_sazonal = go.Figure()
+        
+        # Barras com cores condicionais (nome e cor indexados pelo próprio mês)
+        meses = vendas_por_mes['mes'].to_numpy()
+        
+        fig_sazonal.add_trace(go.Bar(
+            x=MESES_NOME[meses - 1],
+            y=vendas_por_mes['faturamento'].to_numpy(dtype=np.float32),
+            marker_color=COR_MES[meses],
+            text=formatar_milhoes(vendas_por_mes['faturamento']),
+            textposition='outside'
+        ))
+        
+        # Linha de média
+        media_anual = vendas_por_mes['faturamento'].mean()
+        fig_sazonal.add_hline(
+            y=media_anual,
+            line_dash="dash",
+            line_color=CORES['secundaria'],
+            annotation_text=f"Média: R$ {media_anual/1e6:.1f}M"
+        )
         
-        elif analise == "Análise Regional":
-            st.markdown("### 🌍 Análise de Performance Regional")
-            
-            # Preparar dados
-            df_regional = df_filtrado.groupby('regiao').agg({
-                'faturamento': 'sum',
-                'quantidade_vendida': 'sum',
-                'margem_lucro': 'mean'
-            }).round(2)
-            
-            # Calcular crescimento YoY
-            df_2023 = df_filtrado[df_filtrado['ano'] == 2023].groupby('regiao')['faturamento'].sum()
-            df_2024 = df_filtrado[df_filtrado['ano'] == 2024].groupby('regiao')['faturamento'].sum()
-            crescimento_regional = ((df_2024 - df_2023) / df_2023 * 100).fillna(0)
-            
-            # Criar visualizações
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Mapa de intensidade
-                fig_intensidade = go.Figure(data=[
-                    go.Bar(
-                        y=df_regional.index,
-                        x=df_regional['faturamento'],
-                        orientation='h',
-                        marker=dict(
-                            color=df_regional['faturamento'],
-                            colorscale='YlOrRd',
-                            showscale=True,
-                            colorbar=dict(title="Faturamento")
-                        ),
-                        text=df_regional['faturamento'].apply(lambda x: f'R$ {x/1e6:.1f}M'),
-                        textposition='outside'
-                    )
-                ])
-                
-                fig_intensidade.update_layout(
-                    title="🗺️ Desempenho por Região",
-                    xaxis_title="Faturamento (R$)",
-                    yaxis_title="",
-                    height=400
-                )
-                
-                st.plotly_chart(fig_intensidade, use_container_width=True)
-            
-            with col2:
-                # Crescimento YoY
-                fig_crescimento = go.Figure(data=[
-                    go.Bar(
-                        y=crescimento_regional.index,
-                        x=crescimento_regional.values,
-                        orientation='h',
-                        marker_color=[CORES['sucesso'] if x > 0 else CORES['destaque'] 
-                                     for x in crescimento_regional.values],
-                        text=crescimento_regional.apply(lambda x: f'{x:.1f}%'),
-                        textposition='outside'
-                    )
-                ])
-                
-                fig_crescimento.add_vline(x=0, line_width=2, line_color="black")
-                
-                fig_crescimento.update_layout(
-                    title="📈 Crescimento YoY por Região",
-                    xaxis_title="Crescimento (%)",
-                    yaxis_title="",
-                    height=400
+        fig_sazonal.update_layout(
+            title="📊 Padrão Sazonal - Média de Faturamento por Mês",
+            xaxis_title="Mês",
+            yaxis_title="Faturamento Médio (R$)",
+            showlegend=False,
+            height=400
+        )
+        
+        st.plotly_chart(fig_sazonal, use_container_width=True)
+        
+        # Análise por trimestre
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            vendas_trimestre = agregar_vendas_por_trimestre(cubo_filtrado)
+            
+            fig_trimestre = go.Figure(data=[
+                go.Pie(
+                    labels=vendas_trimestre['trimestre'].to_numpy(),
+                    values=vendas_trimestre['faturamento'].to_numpy(dtype=np.float32),
+                    hole=0.3,
+                    marker=dict(colors=[CORES['principal'], CORES['secundaria'], 
+                                      CORES['alerta'], CORES['destaque']])
                 )
-                
-                st.plotly_chart(fig_crescimento, use_container_width=True)
-            
-            # Evolução temporal por região
-            st.markdown("#### 📊 Evolução Temporal por Região")
-            
-            fig_evolucao = go.Figure()
-            
-            for regiao in df_regional.index:
-                dados_regiao = df_filtrado[df_filtrado['regiao'] == regiao].groupby('data')['faturamento'].sum()
-                
-                fig_evolucao.add_trace(go.Scatter(
-                    x=dados_regiao.index,
-                    y=dados_regiao.values,
-                    mode='lines',
-                    name=regiao,
-                    line=dict(width=3 if regiao == 'Sudeste' else 2)
-                ))
+            ])
             
-            fig_evolucao.update_layout(
-                title="Evolução do Faturamento por Região",
-                xaxis_title="Período",
-                yaxis_title="Faturamento (R$)",
-                hovermode='x unified',
-                height=400
+            fig_trimestre.update_layout(
+                title="Distribuição por Trimestre",
+                height=350
             )
             
-            st.plotly_chart(fig_evolucao, use_container_width=True)
-            
-            # Métricas regionais
-            st.markdown("#### 📊 Métricas Regionais")
-            df_regional['participacao'] = (df_regional['faturamento'] / df_regional['faturamento'].sum() * 100).round(1)
-            df_regional['crescimento_yoy'] = crescimento_regional.round(1)
-            
-            df_display = df_regional[['faturamento', 'participacao', 'margem_lucro', 'crescimento_yoy']].copy()
-            df_display.columns = ['Faturamento', 'Participação (%)', 'Margem (%)', 'Crescimento YoY (%)']
-            df_display['Faturamento'] = df_display['Faturamento'].apply(lambda x: f'R$ {x/1e6:.2f}M')
-            
-            st.dataframe(
-                df_display.style.background_gradient(subset=['Participação (%)'], cmap='YlOrRd'),
-                use_container_width=True
-            )
+            st.plotly_chart(fig_trimestre, use_container_width=True)
         
-        else:  # Análise de Sazonalidade
-            st.markdown("### 📅 Análise de Padrões Sazonais")
+        with col2:
+            # Insights de sazonalidade
+            st.markdown("#### 💡 Insights de Sazonalidade")
             
-            # Análise por mês
-            vendas_por_mes = df_filtrado.groupby('mes')['faturamento'].mean().reset_index()
-            meses_nome = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 
-                         'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+            # Calcular impacto da sazonalidade
+            nov_dez = vendas_por_mes[vendas_por_mes['mes'].isin([11, 12])]['faturamento'].sum()
+            total_ano = vendas_por_mes['faturamento'].sum()
+            impacto_fim_ano = (nov_dez / total_ano) * 100
             
-            # Criar gráfico de sazonalidade
-            fig_sazonal = go.Figure()
+            st.info(f"""
+            **Principais Descobertas:**
             
-            # Barras com cores condicionais
-            cores_mes = []
-            for mes in vendas_por_mes['mes']:
-                if mes in [11, 12]:  # Black Friday e Natal
-                    cores_mes.append(CORES['destaque'])
-                elif mes in [6, 7]:  # Meio do ano
-                    cores_mes.append(CORES['alerta'])
-                else:
-                    cores_mes.append(CORES['neutro'])
+            • **Black Friday/Natal**: Nov-Dez representam {impacto_fim_ano:.1f}% do faturamento anual
             
-            fig_sazonal.add_trace(go.Bar(
-                x=meses_nome,
-                y=vendas_por_mes['faturamento'],
-                marker_color=cores_mes,
-                text=vendas_por_mes['faturamento'].apply(lambda x: f'R$ {x/1e6:.1f}M'),
-                textposition='outside'
-            ))
+            • **Melhor Trimestre**: Q4 com pico de vendas
             
-            # Linha de média
-            media_anual = vendas_por_mes['faturamento'].mean()
-            fig_sazonal.add_hline(
-                y=media_anual,
-                line_dash="dash",
-                line_color=CORES['secundaria'],
-                annotation_text=f"Média: R$ {media_anual/1e6:.1f}M"
-            )
+            • **Período de Baixa**: Janeiro e Fevereiro com vendas reduzidas
             
-            fig_sazonal.update_layout(
-                title="📊 Padrão Sazonal - Média de Faturamento por Mês",
-                xaxis_title="Mês",
-                yaxis_title="Faturamento Médio (R$)",
-                showlegend=False,
-                height=400
-            )
-            
-            st.plotly_chart(fig_sazonal, use_container_width=True)
-            
-            # Análise por trimestre
-            col1, col2 = st.columns(2)
+            • **Oportunidade**: Campanhas no meio do ano para equilibrar sazonalidade
+            """)
+
+# PÁGINA: EVALUATION
+@st.fragment
+def pagina_evaluation(df, versao):
+    """Fase 5: KPIs vs metas, SWOT e score card"""
+    st.title("5️⃣ FASE 5: Evaluation")
+    st.markdown("### Avaliação dos Resultados e KPIs")
+    
+    # Calcular métricas de avaliação
+    kpis = calcular_kpis_avaliacao(df, versao)
+    faturamento_2023 = kpis['faturamento_por_ano'].get(2023, 0.0)
+    faturamento_2024 = kpis['faturamento_por_ano'].get(2024, 0.0)
+    # NaN quando o dataset não tem 2023 (os valores do cache são floats do Python)
+    if faturamento_2023:
+        crescimento_yoy = ((faturamento_2024 - faturamento_2023) / faturamento_2023) * 100
+    else:
+        crescimento_yoy = np.nan
+    margem_media = kpis['margem']
+    
+    # KPIs vs Metas
+    st.markdown("### 🎯 Avaliação de KPIs vs Metas")
+    
+    kpis_avaliacao = [
+        {
+            'nome': 'Crescimento de Receita',
+            'meta': 15,
+            'realizado': crescimento_yoy,
+            'unidade': '%',
+            'tipo': 'percentual'
+        },
+        {
+            'nome': 'Margem de Lucro',
+            'meta': 35,
+            'realizado': margem_media,
+            'unidade': '%',
+            'tipo': 'percentual'
+        },
+        {
+            'nome': 'ROI Médio dos Produtos',
+            'meta': 25,
+            'realizado': kpis['roi'],
+            'unidade': '%',
+            'tipo': 'percentual'
+        }
+    ]
+    
+    # Metas atingidas, comparadas uma única vez para todos os KPIs
+    realizado = np.array([kpi['realizado'] for kpi in kpis_avaliacao])
+    meta = np.array([kpi['meta'] for kpi in kpis_avaliacao])
+    atingidos = realizado >= meta
+    
+    cols = st.columns(len(kpis_avaliacao))
+    
+    for i, kpi in enumerate(kpis_avaliacao):
+        with cols[i]:
+            atingido = atingidos[i]
+            delta = kpi['realizado'] - kpi['meta']
             
-            with col1:
-                vendas_trimestre = df_filtrado.groupby('trimestre')['faturamento'].sum().reset_index()
-                
-                fig_trimestre = go.Figure(data=[
-                    go.Pie(
-                        labels=vendas_trimestre['trimestre'],
-                        values=vendas_trimestre['faturamento'],
-                        hole=0.3,
-                        marker=dict(colors=[CORES['principal'], CORES['secundaria'], 
-                                          CORES['alerta'], CORES['destaque']])
-                    )
-                ])
-                
-                fig_trimestre.update_layout(
-                    title="Distribuição por Trimestre",
-                    height=350
-                )
-                
-                st.plotly_chart(fig_trimestre, use_container_width=True)
+            st.metric(
+                label=kpi['nome'],
+                value=f"{kpi['realizado']:.1f}{kpi['unidade']}",
+                delta=f"{delta:+.1f}{kpi['unidade']} vs meta",
+                delta_color="normal" if atingido else "inverse"
+            )
             
-            with col2:
-                # Insights de sazonalidade
-                st.markdown("#### 💡 Insights de Sazonalidade")
-                
-                # Calcular impacto da sazonalidade
-                nov_dez = vendas_por_mes[vendas_por_mes['mes'].isin([11, 12])]['faturamento'].sum()
-                total_ano = vendas_por_mes['faturamento'].sum()
-                impacto_fim_ano = (nov_dez / total_ano) * 100
-                
-                st.info(f"""
-                **Principais Descobertas:**
-                
-                • **Black Friday/Natal**: Nov-Dez representam {impacto_fim_ano:.1f}% do faturamento anual
-                
-                • **Melhor Trimestre**: Q4 com pico de vendas
-                
-                • **Período de Baixa**: Janeiro e Fevereiro com vendas reduzidas
-                
-                • **Oportunidade**: Campanhas no meio do ano para equilibrar sazonalidade
-                """)
-    
-    # PÁGINA: EVALUATION
-    elif pagina == "5️⃣ Evaluation":
-        st.title("5️⃣ FASE 5: Evaluation")
-        st.markdown("### Avaliação dos Resultados e KPIs")
-        
-        # Calcular métricas de avaliação
-        faturamento_2023 = df[df['ano'] == 2023]['faturamento'].sum()
-        faturamento_2024 = df[df['ano'] == 2024]['faturamento'].sum()
-        crescimento_yoy = ((faturamento_2024 - faturamento_2023) / faturamento_2023) * 100
-        margem_media = df['margem_lucro'].mean()
-        
-        # KPIs vs Metas
-        st.markdown("### 🎯 Avaliação de KPIs vs Metas")
-        
-        kpis_avaliacao = [
-            {
-                'nome': 'Crescimento de Receita',
-                'meta': 15,
-                'realizado': crescimento_yoy,
-                'unidade': '%',
-                'tipo': 'percentual'
-            },
-            {
-                'nome': 'Margem de Lucro',
-                'meta': 35,
-                'realizado': margem_media,
-                'unidade': '%',
-                'tipo': 'percentual'
-            },
-            {
-                'nome': 'ROI Médio dos Produtos',
-                'meta': 25,
-                'realizado': df['roi'].mean(),
-                'unidade': '%',
-                'tipo': 'percentual'
-            }
-        ]
-        
-        cols = st.columns(len(kpis_avaliacao))
-        
-        for i, kpi in enumerate(kpis_avaliacao):
-            with cols[i]:
-                atingido = kpi['realizado'] >= kpi['meta']
-                delta = kpi['realizado'] - kpi['meta']
-                
-                st.metric(
-                    label=kpi['nome'],
-                    value=f"{kpi['realizado']:.1f}{kpi['unidade']}",
-                    delta=f"{delta:+.1f}{kpi['unidade']} vs meta",
-                    delta_color="normal" if atingido else "inverse"
-                )
-                
-                if atingido:
-                    st.success("✅ Meta Atingida")
-                else:
-                    st.error("❌ Meta Não Atingida")
-        
-        st.markdown("---")
-        
-        # Análise SWOT
-        st.markdown("### 📊 Análise SWOT Baseada em Dados")
+            if atingido:
+                st.success("✅ Meta Atingida")
+            else:
+                st.error("❌ Meta Não Atingida")
+    
+    st.markdown("---")
+    
+    # Análise SWOT
+    st.markdown("### 📊 Análise SWOT Baseada em Dados")
+    
+    forcas = (
+        f"Crescimento de {crescimento_yoy:.1f}% YoY",
+        f"Margem saudável de {margem_media:.1f}%",
+        *FORCAS_FIXAS
+    )
+    
+    # Os quatro quadrantes em uma grade 2x2, emitida com um único st.markdown
+    quadrantes_swot = [
+        ("💪 FORÇAS", forcas, MARCADORES_SWOT['forcas']),
+        ("⚠️ FRAQUEZAS", FRAQUEZAS, MARCADORES_SWOT['fraquezas']),
+        ("🎯 OPORTUNIDADES", OPORTUNIDADES, MARCADORES_SWOT['oportunidades']),
+        ("🚨 AMEAÇAS", AMEACAS, MARCADORES_SWOT['ameacas'])
+    ]
+    st.markdown(
+        "<div style='display: grid; grid-template-columns: 1fr 1fr; gap: 0 1rem;'>"
+        + "".join(f"<div><h4>{titulo}</h4>{lista_html(itens, marcador)}</div>"
+                  for titulo, itens, marcador in quadrantes_swot)
+        + "</div>",
+        unsafe_allow_html=True
+    )
+    
+    # Score Card Final
+    st.markdown("### 📈 Score Card de Performance")
+    
+    percentual_atingimento = atingidos.mean() * 100
+    
+    st.progress(percentual_atingimento / 100)
+    st.markdown(f"**Performance Geral: {percentual_atingimento:.0f}% das metas atingidas**")
+
+# PÁGINA: DEPLOYMENT
+@st.fragment
+def pagina_deployment():
+    """Fase 6: roadmap, matriz de priorização e recomendações"""
+    st.title("6️⃣ FASE 6: Deployment")
+    st.markdown("### Plano de Ação e Implementação")
+    
+    # Roadmap
+    st.markdown("### 📅 Roadmap Estratégico 2025")
+    
+    st.markdown(ROADMAP_HTML, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Matriz de Priorização
+    st.markdown("### 🎯 Matriz de Priorização de Iniciativas")
+    
+    st.plotly_chart(figura_matriz_priorizacao(), use_container_width=True)
+    
+    # Recomendações finais
+    st.markdown("### 📋 Recomendações Estratégicas")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("#### 🚀 Curto Prazo (Q1 2025)")
+        st.write("""
+        • Implementar dashboard real-time
+        • Piloto expansão Norte
+        • Otimizar estoque sazonal
+        • Treinar equipe de vendas
+        """)
+    
+    with col2:
+        st.markdown("#### 📈 Médio Prazo (Q2-Q3)")
+        st.write("""
+        • Lançar linha Premium
+        • Parcerias marketplaces
+        • Programa fidelidade
+        • Automação processos
+        """)
+    
+    with col3:
+        st.markdown("#### 🎯 Longo Prazo (Q4+)")
+        st.write("""
+        • Expansão completa regiões
+        • 3 novos produtos
+        • Meta: 50% crescimento
+        • Liderança no segmento
+        """)
+
+# PÁGINA: CONCEITOS DE VISUALIZAÇÃO
+@st.fragment
+def pagina_conceitos(df, versao):
+    """Conceitos de visualização e percepção visual aplicados no dashboard"""
+    import plotly.graph_objects as go
+    
+    st.title("🎓 Conceitos de Visualização e Percepção Visual")
+    st.markdown("### Princípios Aplicados neste Dashboard")
+    
+    # Tabs para diferentes conceitos
+    tab1, tab2, tab3, tab4 = st.tabs(["Atributos Pré-Atentivos", "Princípios Gestalt", 
+                                      "Boas Práticas", "Antes vs Depois"])
+    
+    with tab1:
+        st.markdown("### 👁️ Atributos Pré-Atentivos")
+        st.info("Características visuais processadas automaticamente pelo cérebro em milissegundos")
         
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown("#### 💪 FORÇAS")
-            forcas = [
-                f"Crescimento de {crescimento_yoy:.1f}% YoY",
-                f"Margem saudável de {margem_media:.1f}%",
-                "Domínio no Sudeste (40% do mercado)",
-                "Portfólio diversificado"
-            ]
-            for f in forcas:
-                st.success(f"• {f}")
+            st.markdown("#### 🎨 COR")
+            st.write("""
+            • Diferenciação instantânea de categorias
+            • Destaque de informações críticas
+            • Indicação de performance (verde/vermelho)
+            """)
             
-            st.markdown("#### 🎯 OPORTUNIDADES")
-            oportunidades = [
-                "Potencial de 45% no Norte/Nordeste",
-                "Demanda crescente por Notebooks",
-                "Expansão em acessórios",
-                "Novos canais de venda"
-            ]
-            for o in oportunidades:
-                st.info(f"• {o}")
+            # Demonstração
+            st.plotly_chart(figura_demo_cor(), use_container_width=True)
         
         with col2:
-            st.markdown("#### ⚠️ FRAQUEZAS")
-            fraquezas = [
-                "Baixa penetração no Norte (7%)",
-                "Dependência do Q4 (30% vendas)",
-                "Variação de margem regional",
-                "Concentração em poucos produtos"
-            ]
-            for f in fraquezas:
-                st.warning(f"• {f}")
+            st.markdown("#### 📏 TAMANHO")
+            st.write("""
+            • Representação de magnitude
+            • Hierarquia de importância
+            • Comparação visual rápida
+            """)
             
-            st.markdown("#### 🚨 AMEAÇAS")
-            ameacas = [
-                "Sazonalidade afeta fluxo de caixa",
-                "Concentração regional = risco",
-                "Competição crescente",
-                "Volatilidade econômica"
-            ]
-            for a in ameacas:
-                st.error(f"• {a}")
-        
-        # Score Card Final
-        st.markdown("### 📈 Score Card de Performance")
-        
-        score_total = sum([1 for kpi in kpis_avaliacao if kpi['realizado'] >= kpi['meta']])
-        percentual_atingimento = (score_total / len(kpis_avaliacao)) * 100
-        
-        st.progress(percentual_atingimento / 100)
-        st.markdown(f"**Performance Geral: {percentual_atingimento:.0f}% das metas atingidas**")
-    
-    # PÁGINA: DEPLOYMENT
-    elif pagina == "6️⃣ Deployment":
-        st.title("6️⃣ FASE 6: Deployment")
-        st.markdown("### Plano de Ação e Implementação")
-        
-        # Roadmap
-        st.markdown("### 📅 Roadmap Estratégico 2025")
-        
-        roadmap = {
-            'Q1 2025': {
-                'foco': 'Expansão Regional',
-                'acoes': ['Piloto no Norte', 'Parceiros locais', 'Análise de mercado'],
-                'cor': CORES['principal']
-            },
-            'Q2 2025': {
-                'foco': 'Novos Produtos',
-                'acoes': ['Linha Premium', 'Testes A/B', 'Feedback clientes'],
-                'cor': CORES['secundaria']
-            },
-            'Q3 2025': {
-                'foco': 'Otimização',
-                'acoes': ['Logística', 'Automação', 'Redução custos'],
-                'cor': CORES['alerta']
-            },
-            'Q4 2025': {
-                'foco': 'Black Friday',
-                'acoes': ['Estoque', 'Marketing', 'Promoções'],
-                'cor': CORES['destaque']
-            }
-        }
-        
-        cols = st.columns(4)
-        for i, (trimestre, info) in enumerate(roadmap.items()):
-            with cols[i]:
-                st.markdown(f"""
-                <div style='background-color: {info['cor']}; color: white; padding: 15px; 
-                           border-radius: 10px; text-align: center; height: 200px;'>
-                    <h4>{trimestre}</h4>
-                    <h5>{info['foco']}</h5>
-                    <ul style='text-align: left; font-size: 12px;'>
-                        {''.join([f"<li>{acao}</li>" for acao in info['acoes']])}
-                    </ul>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # Matriz de Priorização
-        st.markdown("### 🎯 Matriz de Priorização de Iniciativas")
-        
-        iniciativas = {
-            'Expansão Regional': {'impacto': 8, 'esforco': 7},
-            'Novos Produtos': {'impacto': 6, 'esforco': 9},
-            'Otimização Margem': {'impacto': 9, 'esforco': 5},
-            'Marketing Digital': {'impacto': 5, 'esforco': 6},
-            'Automação': {'impacto': 7, 'esforco': 4},
-            'Fidelização': {'impacto': 6, 'esforco': 3},
-            'Parcerias': {'impacto': 4, 'esforco': 8}
+            # Demonstração
+            st.plotly_chart(figura_demo_tamanho(), use_container_width=True)
+    
+    with tab2:
+        st.markdown("### 🧩 Princípios Gestalt")
+        st.info("Como o cérebro organiza informações visuais em padrões significativos")
+        
+        princípios = {
+            "Proximidade": "Elementos próximos são percebidos como grupo",
+            "Similaridade": "Elementos similares são vistos como relacionados",
+            "Fechamento": "Tendência a completar formas incompletas",
+            "Continuidade": "Olho segue caminhos e linhas",
+            "Conexão": "Elementos conectados são um grupo"
         }
         
-        fig_matriz = go.Figure()
-        
-        for nome, valores in iniciativas.items():
-            # Determinar quadrante
-            if valores['impacto'] >= 5 and valores['esforco'] < 5:
-                cor = CORES['sucesso']  # Quick wins
-                simbolo = 'star'
-            elif valores['impacto'] >= 5 and valores['esforco'] >= 5:
-                cor = CORES['principal']  # Estratégico
-                simbolo = 'diamond'
-            elif valores['impacto'] < 5 and valores['esforco'] < 5:
-                cor = CORES['neutro']  # Baixa prioridade
-                simbolo = 'circle'
-            else:
-                cor = CORES['alerta']  # Repensar
-                simbolo = 'x'
-            
-            fig_matriz.add_trace(go.Scatter(
-                x=[valores['esforco']],
-                y=[valores['impacto']],
-                mode='markers+text',
-                name=nome,
-                text=[nome],
-                textposition='top center',
-                marker=dict(size=20, color=cor, symbol=simbolo),
-                showlegend=False
-            ))
-        
-        # Adicionar quadrantes
-        fig_matriz.add_hline(y=5, line_dash="dash", line_color="gray", opacity=0.5)
-        fig_matriz.add_vline(x=5, line_dash="dash", line_color="gray", opacity=0.5)
-        
-        # Adicionar labels dos quadrantes
-        fig_matriz.add_annotation(x=2.5, y=8, text="Quick Wins", showarrow=False, font=dict(size=12, color="green"))
-        fig_matriz.add_annotation(x=7.5, y=8, text="Estratégico", showarrow=False, font=dict(size=12, color="blue"))
-        fig_matriz.add_annotation(x=2.5, y=2, text="Baixa Prioridade", showarrow=False, font=dict(size=12, color="gray"))
-        fig_matriz.add_annotation(x=7.5, y=2, text="Repensar", showarrow=False, font=dict(size=12, color="orange"))
-        
-        fig_matriz.update_layout(
-            title="Matriz de Priorização (Impacto vs Esforço)",
-            xaxis_title="Esforço →",
-            yaxis_title="Impacto →",
-            xaxis=dict(range=[0, 10]),
-            yaxis=dict(range=[0, 10]),
-            height=500
-        )
+        for principio, descricao in princípios.items():
+            st.markdown(f"**{principio}**: {descricao}")
+    
+    with tab3:
+        st.markdown("### ✅ Boas Práticas Aplicadas")
         
-        st.plotly_chart(fig_matriz, use_container_width=True)
+        st.markdown(BOAS_PRATICAS_MD)
+    
+    with tab4:
+        st.markdown("### 🔄 Transformação: Antes vs Depois")
         
-        # Recomendações finais
-        st.markdown("### 📋 Recomendações Estratégicas")
+        col1, col2 = st.columns(2)
         
-        col1, col2, col3 = st.columns(3)
+        dados_exemplo, dados_sorted, cores = preparar_antes_depois(df, versao)
         
         with col1:
-            st.markdown("#### 🚀 Curto Prazo (Q1 2025)")
-            st.write("""
-            • Implementar dashboard real-time
-            • Piloto expansão Norte
-            • Otimizar estoque sazonal
-            • Treinar equipe de vendas
+            st.markdown("#### ❌ Sem Princípios de Design")
+            
+            fig_antes = go.Figure(data=[
+                go.Bar(
+                    x=dados_exemplo.index,
+                    y=dados_exemplo.values,
+                    marker_color='blue'
+                )
+            ])
+            fig_antes.update_layout(
+                title="Gráfico Básico",
+                xaxis_title="Produtos",
+                yaxis_title="Valores",
+                height=400
+            )
+            st.plotly_chart(fig_antes, use_container_width=True)
+            
+            st.error("""
+            **Problemas:**
+            • Difícil identificar insights
+            • Sem hierarquia visual
+            • Cores sem significado
+            • Falta contexto
             """)
         
         with col2:
-            st.markdown("#### 📈 Médio Prazo (Q2-Q3)")
-            st.write("""
-            • Lançar linha Premium
-            • Parcerias marketplaces
-            • Programa fidelidade
-            • Automação processos
-            """)
-        
-        with col3:
-            st.markdown("#### 🎯 Longo Prazo (Q4+)")
-            st.write("""
-            • Expansão completa regiões
-            • 3 novos produtos
-            • Meta: 50% crescimento
-            • Liderança no segmento
-            """)
-    
-    # PÁGINA: CONCEITOS DE VISUALIZAÇÃO
-    else:  # Conceitos de Visualização
-        st.title("🎓 Conceitos de Visualização e Percepção Visual")
-        st.markdown("### Princípios Aplicados neste Dashboard")
-        
-        # Tabs para diferentes conceitos
-        tab1, tab2, tab3, tab4 = st.tabs(["Atributos Pré-Atentivos", "Princípios Gestalt", 
-                                          "Boas Práticas", "Antes vs Depois"])
-        
-        with tab1:
-            st.markdown("### 👁️ Atributos Pré-Atentivos")
-            st.info("Características visuais processadas automaticamente pelo cérebro em milissegundos")
-            
-            col1, col2 = st.columns(2)
+            st.markdown("#### ✅ Com Princípios Aplicados")
             
-            with col1:
-                st.markdown("#### 🎨 COR")
-                st.write("""
-                • Diferenciação instantânea de categorias
-                • Destaque de informações críticas
-                • Indicação de performance (verde/vermelho)
-                """)
-                
-                # Demonstração
-                fig_cor = go.Figure(data=[
-                    go.Bar(
-                        x=['A', 'B', 'C', 'D', 'E'],
-                        y=[10, 15, 13, 17, 9],
-                        marker_color=[CORES['neutro'], CORES['neutro'], CORES['destaque'], 
-                                     CORES['neutro'], CORES['neutro']]
-                    )
-                ])
-                fig_cor.update_layout(
-                    title="Cor direciona atenção instantaneamente",
-                    showlegend=False,
-                    height=300
-                )
-                st.plotly_chart(fig_cor, use_container_width=True)
-            
-            with col2:
-                st.markdown("#### 📏 TAMANHO")
-                st.write("""
-                • Representação de magnitude
-                • Hierarquia de importância
-                • Comparação visual rápida
-                """)
-                
-                # Demonstração
-                fig_tamanho = go.Figure(data=[
-                    go.Scatter(
-                        x=[1, 2, 3, 4, 5],
-                        y=[1, 1, 1, 1, 1],
-                        mode='markers',
-                        marker=dict(
-                            size=[10, 20, 50, 30, 15],
-                            color=CORES['principal']
-                        )
-                    )
-                ])
-                fig_tamanho.update_layout(
-                    title="Tamanho indica magnitude",
-                    showlegend=False,
-                    height=300,
-                    xaxis=dict(showticklabels=False),
-                    yaxis=dict(showticklabels=False)
+            fig_depois = go.Figure(data=[
+                go.Bar(
+                    y=dados_sorted.index,
+                    x=dados_sorted.values,
+                    orientation='h',
+                    marker_color=cores,
+                    text=formatar_milhoes(dados_sorted),
+                    textposition='outside'
                 )
-                st.plotly_chart(fig_tamanho, use_container_width=True)
-        
-        with tab2:
-            st.markdown("### 🧩 Princípios Gestalt")
-            st.info("Como o cérebro organiza informações visuais em padrões significativos")
-            
-            princípios = {
-                "Proximidade": "Elementos próximos são percebidos como grupo",
-                "Similaridade": "Elementos similares são vistos como relacionados",
-                "Fechamento": "Tendência a completar formas incompletas",
-                "Continuidade": "Olho segue caminhos e linhas",
-                "Conexão": "Elementos conectados são um grupo"
-            }
-            
-            for principio, descricao in princípios.items():
-                st.markdown(f"**{principio}**: {descricao}")
-        
-        with tab3:
-            st.markdown("### ✅ Boas Práticas Aplicadas")
-            
-            praticas = [
-                "📊 **Escolha apropriada de gráficos**: Linha para tendências, Barra para comparações",
-                "🎨 **Uso estratégico de cores**: Máximo 5-7 cores distintas",
-                "📝 **Hierarquia clara**: Títulos, subtítulos e anotações",
-                "🎯 **Foco no essencial**: Eliminação de elementos desnecessários",
-                "📖 **Narrativa visual**: Guiar o leitor através dos dados",
-                "♿ **Acessibilidade**: Contraste adequado e texto legível"
-            ]
-            
-            for pratica in praticas:
-                st.write(pratica)
-        
-        with tab4:
-            st.markdown("### 🔄 Transformação: Antes vs Depois")
+            ])
             
-            col1, col2 = st.columns(2)
+            fig_depois.update_layout(
+                title="📊 Performance de Produtos - Análise Visual",
+                xaxis_title="Faturamento Total",
+                yaxis_title="",
+                height=400,
+                xaxis=dict(tickformat='R$ ,.0f')
+            )
             
-            dados_exemplo = df.groupby('produto')['faturamento'].sum().head(5)
+            # Adicionar anotação (a série está em ordem crescente: o líder é o último)
+            fig_depois.add_annotation(
+                x=dados_sorted.iat[-1],
+                y=dados_sorted.index[-1],
+                text="Líder de vendas!",
+                showarrow=True,
+                arrowhead=2,
+                arrowcolor=CORES['sucesso']
+            )
             
-            with col1:
-                st.markdown("#### ❌ Sem Princípios de Design")
-                
-                fig_antes = go.Figure(data=[
-                    go.Bar(
-                        x=dados_exemplo.index,
-                        y=dados_exemplo.values,
-                        marker_color='blue'
-                    )
-                ])
-                fig_antes.update_layout(
-                    title="Gráfico Básico",
-                    xaxis_title="Produtos",
-                    yaxis_title="Valores",
-                    height=400
-                )
-                st.plotly_chart(fig_antes, use_container_width=True)
-                
-                st.error("""
-                **Problemas:**
-                • Difícil identificar insights
-                • Sem hierarquia visual
-                • Cores sem significado
-                • Falta contexto
-                """)
+            st.plotly_chart(fig_depois, use_container_width=True)
             
-            with col2:
-                st.markdown("#### ✅ Com Princípios Aplicados")
-                
-                dados_sorted = dados_exemplo.sort_values(ascending=True)
-                cores = [CORES['sucesso'] if v == dados_sorted.max() else 
-                        CORES['destaque'] if v == dados_sorted.min() else 
-                        CORES['neutro'] for v in dados_sorted.values]
-                
-                fig_depois = go.Figure(data=[
-                    go.Bar(
-                        y=dados_sorted.index,
-                        x=dados_sorted.values,
-                        orientation='h',
-                        marker_color=cores,
-                        text=dados_sorted.apply(lambda x: f'R$ {x/1e6:.1f}M'),
-                        textposition='outside'
-                    )
-                ])
-                
-                fig_depois.update_layout(
-                    title="📊 Performance de Produtos - Análise Visual",
-                    xaxis_title="Faturamento Total",
-                    yaxis_title="",
-                    height=400,
-                    xaxis=dict(tickformat='R$ ,.0f')
-                )
-                
-                # Adicionar anotação
-                fig_depois.add_annotation(
-                    x=dados_sorted.max(),
-                    y=dados_sorted.idxmax(),
-                    text="Líder de vendas!",
-                    showarrow=True,
-                    arrowhead=2,
-                    arrowcolor=CORES['sucesso']
-                )
-                
-                st.plotly_chart(fig_depois, use_container_width=True)
-                
-                st.success("""
-                **Melhorias:**
-                • Insights imediatos
-                • Cores com significado
-                • Valores destacados
-                • Contexto claro
-                """)
+            st.success("""
+            **Melhorias:**
+            • Insights imediatos
+            • Cores com significado
+            • Valores destacados
+            • Contexto claro
+            """)
+
+# =============================================================================
+# SIDEBAR - NAVEGAÇÃO E FILTROS
+# =============================================================================
+
+logo = carregar_logo()
+st.sidebar.image(logo if logo is not None else LOGO_URL, use_container_width=True)
+st.sidebar.title("🔄 Metodologia CRISP-DM")
+st.sidebar.markdown("---")
+
+# Menu de navegação
+pagina = st.sidebar.selectbox(
+    "Selecione a Fase:",
+    [
+        "📚 Visão Geral",
+        "1️⃣ Business Understanding",
+        "2️⃣ Data Understanding",
+        "3️⃣ Data Preparation",
+        "4️⃣ Modeling & Analysis",
+        "5️⃣ Evaluation",
+        "6️⃣ Deployment",
+        "🎓 Conceitos de Visualização"
+    ]
+)
+
+st.sidebar.markdown("---")
+
+# Carregar dados (a versão chaveia o carregamento e os caches derivados do dataset completo)
+versao = versao_dados()
+df = carregar_dados(versao)
+
+if df is not None:
+    # Filtros globais
+    st.sidebar.subheader("🔍 Filtros Globais")
+    
+    # Filtro de período
+    anos_disponiveis = opcoes_filtro(df, 'ano', versao)
+    anos_selecionados = st.sidebar.multiselect(
+        "Anos:",
+        anos_disponiveis,
+        default=anos_disponiveis
+    )
+    
+    # Filtro de região
+    regioes_disponiveis = opcoes_filtro(df, 'regiao', versao)
+    regioes_selecionadas = st.sidebar.multiselect(
+        "Regiões:",
+        regioes_disponiveis,
+        default=regioes_disponiveis
+    )
+    
+    # Filtro de produto
+    produtos_disponiveis = opcoes_filtro(df, 'produto', versao)
+    produtos_selecionados = st.sidebar.multiselect(
+        "Produtos:",
+        produtos_disponiveis,
+        default=produtos_disponiveis
+    )
+    
+    # Aplicar filtros (tuplas para que o cache reconheça seleções repetidas)
+    chave_filtros = (
+        tuple(anos_selecionados),
+        tuple(regioes_selecionadas),
+        tuple(produtos_selecionados)
+    )
+    df_filtrado = filtrar_dados(indexar_dados(df, versao, 'vendas'), versao, 'vendas', *chave_filtros)
+    cubo_filtrado = filtrar_dados(
+        indexar_dados(montar_cubo(df, versao), versao, 'cubo'), versao, 'cubo', *chave_filtros
+    )
+    
+    # Agregações comuns às páginas, reaproveitadas na sessão enquanto os dados e os filtros não mudam
+    chave_agregados = (versao, *chave_filtros)
+    if st.session_state.get('agregados', {}).get('chave') != chave_agregados:
+        st.session_state['agregados'] = {
+            'chave': chave_agregados,
+            'por_regiao': agrupar(cubo_filtrado, 'regiao')['faturamento'].sum(),
+            'por_mes': agrupar(cubo_filtrado, 'mes')['faturamento'].sum()
+        }
+    agregados = st.session_state['agregados']
+    
+    # Calcular métricas
+    metricas = calcular_metricas_principais(cubo_filtrado)
+
+# =============================================================================
+# CONTEÚDO PRINCIPAL - BASEADO NA PÁGINA SELECIONADA
+# =============================================================================
+
+if df is None:
+    st.error("Não foi possível carregar os dados. Verifique se o arquivo existe.")
+elif pagina == "📚 Visão Geral":
+    pagina_visao_geral(metricas, cubo_filtrado)
+elif pagina == "1️⃣ Business Understanding":
+    pagina_business_understanding()
+elif pagina == "2️⃣ Data Understanding":
+    pagina_data_understanding(df_filtrado, cubo_filtrado, agregados)
+elif pagina == "3️⃣ Data Preparation":
+    pagina_data_preparation(cubo_filtrado)
+elif pagina == "4️⃣ Modeling & Analysis":
+    pagina_modeling(cubo_filtrado)
+elif pagina == "5️⃣ Evaluation":
+    pagina_evaluation(df, versao)
+elif pagina == "6️⃣ Deployment":
+    pagina_deployment()
+else:  # Conceitos de Visualização
+    pagina_conceitos(df, versao)
 
 # Footer
 st.markdown("---")